@@ -1,19 +1,23 @@
 #!/usr/bin/python
 '''This shows how to configure and use the ADCs.
 '''
-from mcp2221 import MCP2221, find_devices
+from mcp2221 import MCP2221, find_first
 from mcp2221.enums import ReferenceVoltageSource,\
     ReferenceVoltageValue, GPIO1Function, GPIO2Function, GPIO3Function
 
 # opens 1st device found
-mcp = MCP2221(find_devices()[0])
-# reads ADC voltage reference source using property
-print(mcp.adc_reference_source)
-# this tells if the ADC uses VDD or the internal
-# reference as a voltage reference; if the later
-# is true, then we may want to read the internal
-# voltage reference value that way (with property):
-print(mcp.adc_reference_voltage)
+mcp = MCP2221(find_first())
+# back-to-back reads can share one status report; within
+# a status_snapshot block, the report is fetched once and
+# subsequent reads are served from cache
+with mcp.status_snapshot():
+    # reads ADC voltage reference source using property
+    print(mcp.adc_reference_source)
+    # this tells if the ADC uses VDD or the internal
+    # reference as a voltage reference; if the later
+    # is true, then we may want to read the internal
+    # voltage reference value that way (with property):
+    print(mcp.adc_reference_voltage)
 # sets the ADC reference source and voltage reference
 # using properties; note that setting voltage reference voltage
 # when reference source is Vdd is useless, but it can be done
@@ -38,3 +42,7 @@ except AttributeError as e:
     print("adcx_value properties are read-only: {}".format(e))
 # reads the same ADC but using class method
 print(mcp.read_adc(0))
+# all three ADCs can be read with a single USB transaction,
+# either with the class method or the read-only property
+print(mcp.read_adcs())
+print(mcp.adc_values)
@@ -1,18 +1,22 @@
 #!/usr/bin/python
 '''This shows how to configure and use the DAC.
 '''
-from mcp2221 import MCP2221, find_devices
+from mcp2221 import MCP2221, find_first
 from mcp2221.enums import ReferenceVoltageSource, ReferenceVoltageValue, GPIO2Function, GPIO3Function
 
 # opens 1st device found
-mcp = MCP2221(find_devices()[0])
-# reads DAC voltage reference source using property
-print(mcp.dac_reference_source)
-# this tells if the DAC uses VDD or the internal
-# reference as a voltage reference; if the later
-# is true, then we may want to read the internal
-# voltage reference value that way (with property):
-print(mcp.dac_reference_voltage)
+mcp = MCP2221(find_first())
+# back-to-back reads can share one status report; within
+# a status_snapshot block, the report is fetched once and
+# subsequent reads are served from cache
+with mcp.status_snapshot():
+    # reads DAC voltage reference source using property
+    print(mcp.dac_reference_source)
+    # this tells if the DAC uses VDD or the internal
+    # reference as a voltage reference; if the later
+    # is true, then we may want to read the internal
+    # voltage reference value that way (with property):
+    print(mcp.dac_reference_voltage)
 # sets the DAC reference source and voltage reference
 # using properties; note that setting voltage reference voltage
 # when reference source is Vdd is useless, but it can be done
@@ -41,3 +45,9 @@ mcp.write_dac_powerup_value(0)
 mcp.dac_value = 5
 # writes DAC value using class method
 mcp.write_dac(10)
+# reference source, reference voltage and output value can also be
+# written with a single USB transaction; parameters left out keep
+# their current value
+mcp.write_dac_settings(source=ReferenceVoltageSource.Internal,
+                       voltage=ReferenceVoltageValue.Voltage2_048V,
+                       value=16)
@@ -19,9 +19,12 @@ product ID 221 to their chip (hence the default values).
 This said, we can get to the HID bit. The chip communicates with
 the host through the USB-HID protocol. We use the hidapi wrapper
 for python, which provides a function to enumerate all connected
-devices. The function 'find_devices' filters relevant devices. 
+devices. The function 'find_devices' filters relevant devices.
+If you only need one device, 'find_first' returns the first
+matching descriptor and stops enumerating as soon as it is found.
 '''
 
-from mcp2221 import find_devices
+from mcp2221 import find_devices, find_first
 
-print(find_devices(vendor_id=1240, product_id=221))
\ No newline at end of file
+print(find_devices(vendor_id=1240, product_id=221))
+print(find_first(vendor_id=1240, product_id=221))
\ No newline at end of file
@@ -4,11 +4,11 @@ basic operations with GPIO pins.
 There's a 2nd example, gpio_powerup.py, that shows how
 to set values in flash memory.
 '''
-from mcp2221 import MCP2221, find_devices
+from mcp2221 import MCP2221, find_first
 from mcp2221.enums import GPIO0Function, GPIODirection
 
 # opens 1st device found
-mcp = MCP2221(find_devices()[0])
+mcp = MCP2221(find_first())
 # reads GPIO pin 0 function using property
 # example output: GPIO0Function.GPIO
 # Check enums GPIOxFunction to see what is available
@@ -41,3 +41,8 @@ mcp.gpio0_value = True
 print(mcp.gpio_read_value(0))
 # writes pin value with class method
 mcp.gpio_write_value(0, False)
+# directions and values of several pins can also be set in one
+# USB transaction; keys are pin indices, values are
+# (direction, value) tuples where None leaves a setting unchanged
+mcp.gpio_write_batch({0: (GPIODirection.Output, True),
+                      1: (GPIODirection.Output, False)})
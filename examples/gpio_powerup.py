@@ -5,11 +5,11 @@ remembered upon reboot.
 There's a 2nd example, gpio.py, that shows how to set
 run-time values and properties of GPIO pins.
 '''
-from mcp2221 import MCP2221, find_devices
+from mcp2221 import MCP2221, find_first
 from mcp2221.enums import GPIO0Function, GPIODirection, MemoryType
 
 # opens 1st device found
-mcp = MCP2221(find_devices()[0])
+mcp = MCP2221(find_first())
 # sets target memory to flash memory
 mcp.set_default_memory_target(MemoryType.Flash)
 # It is also possible to pass the MemoryType argument to
@@ -49,6 +49,12 @@ mcp.gpio0_powerup_value = True
 print(mcp.gpio_read_powerup_value(0))
 # writes power-up pin value with class method
 mcp.gpio_write_powerup_value(0, False)
+# function, power-up direction and power-up value of several pins
+# can also be written with a single flash command; keys are pin
+# indices, values are (function, direction, value) tuples where
+# None keeps the current setting; this issues one flash program
+# cycle instead of one per setting
+mcp.write_flash_gpio_settings({0: (GPIO0Function.GPIO, GPIODirection.Output, False)})
 
 # After disconnecting and reconnecting your device,
 # GPIO pin 0 should be now set as output with value 0
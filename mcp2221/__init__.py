@@ -6,33 +6,190 @@ protocol converters, together with helper functions and classes.
    
    Functions:
        find_devices
-   
+       find_first
+       invalidate_device_cache
+
    Submodules:
        enums
        exceptions
 """
 
-__all__ = ['MCP2221', 'find_devices']
+__all__ = ['MCP2221', 'find_devices', 'find_first', 'invalidate_device_cache']
 
 import os
+import time
 import hid
+import struct
 import warnings
+from contextlib import contextmanager
 
 from .enums import *
 from .exceptions import *
 
-def find_devices(vendor_id:int = 1240, product_id:int = 221) -> list:
+# the OS doesn't change while the process runs => check once at import
+# time instead of on every HID transaction
+_IS_WINDOWS = (os.name == 'nt')
+
+# cache for enumeration results, keyed on (id filter set, serial number);
+# values are (time stamp, descriptor list) pairs
+_ENUM_CACHE = {}
+# time during which cached enumeration results remain valid, in seconds;
+# enumerating the HID bus is slow and results rarely change, hence
+# back-to-back calls get served from cache
+_ENUM_CACHE_TTL = 2.0
+
+def find_devices(vendor_id:int = 1240, product_id:int = 221, serial_number:str = None, filters:'list[tuple]' = None) -> list:
     """Finds HID devices with given vendor and product IDs,
     and returns a list of found descriptors.
 
     Parameters:
         vendor_id(int): the vendor ID to search for (default 1240)
         product_id(int): the product ID to search for (default 221)
+        serial_number(str): if given, only devices with this serial
+                            number are returned (default None);
+                            this requires the CDC serial number
+                            enumeration flag to be set on the chip
+        filters(list[tuple]): if given, a list of (vendor_id, product_id)
+                              pairs to search for; this overrides the
+                              vendor_id and product_id arguments and
+                              serves several product searches with a
+                              single bus walk (default None)
+
+    Note:
+        Results are cached for a short time, as bus enumeration can
+        take several seconds on hosts with many HID devices. Calls
+        issued within this time get answered with cached results.
+    """
+    if filters != None:
+        wanted = frozenset(filters)
+    else:
+        wanted = frozenset(((vendor_id, product_id),))
+    key = (wanted, serial_number)
+    if key in _ENUM_CACHE:
+        tstamp, devs = _ENUM_CACHE[key]
+        if time.monotonic() - tstamp < _ENUM_CACHE_TTL:
+            return devs
+    devs = [dev for dev in hid.enumerate()
+            if (dev["vendor_id"], dev["product_id"]) in wanted
+            and (serial_number == None or dev["serial_number"]==serial_number)]
+    _ENUM_CACHE[key] = (time.monotonic(), devs)
+    return devs
+
+def find_first(vendor_id:int = 1240, product_id:int = 221, serial_number:str = None) -> dict:
+    """Finds the first HID device with given vendor and product IDs,
+    and returns its descriptor. Unlike find_devices, this stops
+    enumerating as soon as a match is found.
+
+    Parameters:
+        vendor_id(int): the vendor ID to search for (default 1240)
+        product_id(int): the product ID to search for (default 221)
+        serial_number(str): if given, only a device with this serial
+                            number is returned (default None)
+
+    Returns:
+        dict: descriptor of first device found, or None if none was found.
+    """
+    key = (frozenset(((vendor_id, product_id),)), serial_number)
+    if key in _ENUM_CACHE:
+        tstamp, devs = _ENUM_CACHE[key]
+        if time.monotonic() - tstamp < _ENUM_CACHE_TTL and len(devs)>0:
+            return devs[0]
+    for dev in hid.enumerate(vendor_id, product_id):
+        if serial_number == None or dev["serial_number"]==serial_number:
+            return dev
+    return None
+
+# bit field positions of single-register flash chip settings, used by
+# write_flash_chip_settings; property name => (byte index, mask, shift);
+# built once at import time
+_CHIP_SETTING_FIELDS = {
+    "cdc_sn_enumeration_enable": (0, 0x80, 7),
+    "led_idle_uart_rx_level": (0, 0x40, 6),
+    "led_idle_uart_tx_level": (0, 0x20, 5),
+    "led_idle_i2c_level": (0, 0x10, 4),
+    "suspend_mode_logic_level": (0, 0x08, 3),
+    "usb_configured_logic_level": (0, 0x04, 2),
+    "security_option": (0, 0x03, 0),
+    "clock_output_frequency": (1, 0x07, 0),
+    "clock_output_duty_cycle": (1, 0x18, 3),
+    "dac_powerup_value": (2, 0x1f, 0),
+    "dac_reference_source": (2, 0x20, 5),
+    "dac_reference_voltage": (2, 0xc0, 6),
+    "adc_reference_source": (3, 0x04, 2),
+    "adc_reference_voltage": (3, 0x18, 3),
+    "interrupt_on_rising_edge": (3, 0x20, 5),
+    "interrupt_on_falling_edge": (3, 0x40, 6),
+    "usb_remote_wake_up_attribute": (8, 0x20, 5),
+    "usb_self_powered_attribute": (8, 0x40, 6),
+}
+
+# layout of the 0x61 response, used by _read_sram; subcode =>
+# (start offset, index of length byte); a None start means the register
+# begins right after the chip settings, whose length is in byte 2
+_SRAM_OFFSETS = {SramDataSubcode.ChipSettings: (4, 2),
+                 SramDataSubcode.GPSettings: (None, 3)}
+
+# byte value => tuple of its 8 bits, LSB first; built once at import time
+# so that bit list conversions are table lookups instead of per-call loops
+_BYTE_TO_BITS = tuple(tuple(bool((v >> n) & 0x01) for n in range(8))
+                      for v in range(256))
+# reverse mapping; shorter bit lists get padded with False before lookup
+_BITS_TO_BYTE = {bits: v for v, bits in enumerate(_BYTE_TO_BITS)}
+
+# little endian 16-bit word extractor, bound once; unpacking in C beats
+# reassembling words with shifts and ors in the interpreter
+_U16LE = struct.Struct('<H').unpack_from
+
+def _gpio_single_pin_command(pin:int, offset:int, value:int) -> bytes:
+    """Builds a 0x50 command setting one value or direction of one GPIO pin.
+
+    Parameters:
+        pin(int): GPIO pin index
+        offset(int): 2 for pin value, 4 for pin direction
+        value(int): value to set (0 or 1)
+
+    Returns:
+        bytes: complete 64-byte command.
+    """
+    cmd = bytearray(64)
+    cmd[0] = 0x50
+    cmd[offset + pin*4] = 0x01
+    cmd[offset + 1 + pin*4] = value
+    return bytes(cmd)
+
+# fully built single-pin GPIO commands, keyed on (pin, value); there are
+# only 16 of them, hence they get assembled once at import time and
+# handed to the device as-is, with no per-call command building
+_GPIO_VALUE_CMDS = {(pin, v): _gpio_single_pin_command(pin, 2, v)
+                    for pin in range(4) for v in (0, 1)}
+_GPIO_DIRECTION_CMDS = {(pin, v): _gpio_single_pin_command(pin, 4, v)
+                        for pin in range(4) for v in (0, 1)}
+
+def _dac_value_command(value:int) -> bytes:
+    """Builds a 0x60 command setting the DAC output value.
+
+    Parameters:
+        value(int): DAC value (5 bit)
 
+    Returns:
+        bytes: complete 64-byte command.
+    """
+    cmd = bytearray(64)
+    cmd[0] = 0x60
+    cmd[4] = 0x80 | value
+    return bytes(cmd)
+
+# fully built commands for the 32 possible DAC output values, assembled
+# once at import time; this keeps the per-sample Python work minimal
+# when streaming waveforms through write_dac_sequence
+_DAC_VALUE_CMDS = tuple(_dac_value_command(v) for v in range(32))
+
+def invalidate_device_cache() -> None:
+    """Drops cached enumeration results, so that the next call to
+    find_devices or find_first enumerates the bus again. Useful when
+    a device has just been plugged in or removed.
     """
-    return [dev for dev in hid.enumerate()
-            if dev["vendor_id"]==vendor_id
-            and dev["product_id"]==product_id]
+    _ENUM_CACHE.clear()
 
 
 class MCP2221():
@@ -92,15 +249,36 @@ class MCP2221():
         adc0_value(int): ADC 0 value (read-only)
         adc1_value(int): ADC 1 value (read-only)
         adc2_value(int): ADC 2 value (read-only)
+        adc_values(list): all three ADC values, read in one command (read-only)
         dac_value(int): DAC value (write-only, 5 bit)
-    
+        skip_noop_flash_writes(bool): if True, flash bit writes that
+                                      wouldn't change the stored value
+                                      are skipped (default True)
+
     Protected attributes:
         _opened(bool): True if associated device is opened, False otherwise
         _password(str): password string
         _mem_target(MemoryType): default memory target for data both in flash and SRAM
+        _status_cache(dict): cached command responses within a status_snapshot
+                             block, None outside of it
+        _fw_version(str): firmware version read from the device, None
+                          until first read; reset when a device is opened
+        _flash_pending(dict): in-memory register copies within a flash_batch
+                              block, None outside of it
+        _flash_dirty(set): flash registers modified within a flash_batch block
+        _gpio_pending(dict): buffered GPIO updates within a gpio_batch
+                             block, None outside of it
 
     """
 
+    # commands without side effects, whose responses can be served
+    # from cache within a status_snapshot block
+    __snapshot_codes = (0x10, 0x51, 0x61)
+    # blank report, used to clear the command buffer between commands
+    __empty_report = bytes(64)
+    # time to wait for a command response before giving up, in seconds
+    _response_timeout = 1.0
+
     def __init__(self, dev_descriptor:dict=None, password:str = ""):
         """Class constructor.
 
@@ -120,6 +298,30 @@ class MCP2221():
         self._opened = False
         self._password = password
         self._mem_target = MemoryType.SRAM
+        self._status_cache = None
+        self._fw_version = None
+        self._flash_pending = None
+        self._flash_dirty = set()
+        self._gpio_pending = None
+        # if True, flash bit writes that wouldn't change the stored
+        # value are skipped, sparing a flash program cycle
+        self.skip_noop_flash_writes = True
+        # preallocated command buffer, reused by _build_command for
+        # every report to avoid allocating 64 bytes per transaction;
+        # byte 0 permanently holds the ReportID=0x00 prefix required
+        # on Windows, the command itself lives in the 64-byte view
+        self.__cmdbuf = bytearray(65)
+        self.__cmd = memoryview(self.__cmdbuf)[1:]
+        # fully built reports for short commands (status poll, GPIO and
+        # SRAM reads, I2C chunk requests, ...), keyed on the argument
+        # tuple; these recur on every poll, hence the report is padded
+        # and copied once instead of per transaction
+        self.__report_cache = {}
+        # bound packed-field readers keyed on memory target, looked up
+        # directly by the dual flash/SRAM getters instead of going
+        # through an if/elif dispatch helper on every access
+        self.__mem_packed_readers = {MemoryType.SRAM: self._read_sram_packed,
+                                     MemoryType.Flash: self._read_flash_packed}
         if dev_descriptor != None:
             self.open(dev_descriptor)
 
@@ -146,11 +348,51 @@ class MCP2221():
             self.dev.open_path(dev_descriptor["path"])
             self.dev.set_nonblocking(True)
             self._opened = True
+            self._fw_version = None
         except (OSError, IOError):
             self._opened = False
             raise IOException("Can't open device. Check that the device descriptor exists and that you have access permissions.")
-        # need to fix ADC state, which can return undefined values
-        # in some configurations of pin functions
+        self.__fix_adc_state()
+        return self._opened
+
+    def open_first(self, vendor_id:int = 1240, product_id:int = 221, serial_number:str = None) -> bool:
+        """Opens the first device with given vendor and product IDs,
+        without enumerating the HID bus first. This skips the
+        potentially slow enumeration walk that find_devices performs.
+
+        Parameters:
+            vendor_id(int): the vendor ID to search for (default 1240)
+            product_id(int): the product ID to search for (default 221)
+            serial_number(str): if given, open the device with this
+                                serial number (default None)
+
+        Returns:
+            bool: True if device could be opened, False otherwise.
+
+        Raises:
+            IOException: if device couldn't be opened.
+        """
+        if self._opened == True: return False
+        # create hidapi device instance
+        self.dev = hid.device()
+        try:
+            if serial_number == None:
+                self.dev.open(vendor_id, product_id)
+            else:
+                self.dev.open(vendor_id, product_id, serial_number)
+            self.dev.set_nonblocking(True)
+            self._opened = True
+            self._fw_version = None
+        except (OSError, IOError):
+            self._opened = False
+            raise IOException("Can't open device. Check that a matching device is connected and that you have access permissions.")
+        self.__fix_adc_state()
+        return self._opened
+
+    def __fix_adc_state(self) -> None:
+        """Private command. Fixes ADC state after opening a device, as ADCs
+        can return undefined values in some configurations of pin functions.
+        """
         pin_data = self._read_sram(SramDataSubcode.GPSettings)
         # get pin values from 0x51 as SRAM may not reflect the right ones
         pin_values = self._write(0x51)
@@ -158,15 +400,22 @@ class MCP2221():
         pin_data = [((v & 0xef) | (w<<4)) & 0xff for (v,w) in zip(pin_data, pin_values[2:9:2])]
         pin_data = [((v & 0xf7) | (w<<3)) & 0xff for (v,w) in zip(pin_data, pin_values[3:10:2])]
         tmp_pin_data = [pin_data[0], 0x0, 0x0, 0x0]
+        needs_fix = False
         for n in [1,2,3]:
             # pin state must be treated differently when in input or output mode
             pin_function = pin_data[n] & 0x03
             if pin_function == 0 and pin_data[n] & 0x08: # GPIO input
                 tmp_pin_data[n] |= 0x02 # set to ADC
+                needs_fix = True
             elif pin_function == 2: # ADC
                 tmp_pin_data[n] |= 0x08 # set to GPIO input
+                needs_fix = True
             else:
                 tmp_pin_data[n] = pin_data[n] # no change
+        # no pin in a state requiring the swap => skip the three
+        # write transactions altogether
+        if not needs_fix:
+            return
         # apply temporary state, then original state
         self._write(0x60, 0, 0, 0, 0, 0, 0, 0x80, *tmp_pin_data)
         self._write(0x60, 0, 0, 0, 0, 0, 0, 0x80, *pin_data)
@@ -176,8 +425,7 @@ class MCP2221():
                     0x01, pin_values[4], 0x01, pin_values[5],
                     0x01, pin_values[6], 0x01, pin_values[7],
                     0x01, pin_values[8], 0x01, pin_values[9])
-        return self._opened
-    
+
     @property
     def opened(self) -> bool:
         """Tells if a device associated with this instance
@@ -194,26 +442,78 @@ class MCP2221():
         if self._opened:
             self.dev.close()
             self._opened = False
-    
-    def _build_command(self, *args:bytes) -> bytearray:
+
+    @contextmanager
+    def status_snapshot(self):
+        """Context manager caching device status within its block.
+        Status, SRAM and flash reports get fetched once and subsequent
+        reads are served from the cached bytes, saving one USB
+        round-trip per read.
+        Writing to the device drops the cached reports, so that
+        subsequent reads reflect the new state.
+
+        Example:
+            with mcp.status_snapshot():
+                v0 = mcp.adc0_value
+                v1 = mcp.adc1_value # served from cache
+        """
+        self._status_cache = {}
+        try:
+            yield self
+        finally:
+            self._status_cache = None
+
+    @contextmanager
+    def flash_batch(self):
+        """Context manager coalescing flash writes within its block.
+        Each flash register is read at most once, bit writes are applied
+        to the in-memory copy, and modified registers are written back
+        in one command each when the block exits. This turns N property
+        writes into one read and one write per register, which also
+        spares flash program cycles.
+
+        Example:
+            with mcp.flash_batch():
+                mcp.write_gpio_powerup_direction(0, GPIODirection.Input)
+                mcp.write_gpio_powerup_value(0, True) # flushed on exit
+        """
+        self._flash_pending = {}
+        self._flash_dirty = set()
+        try:
+            yield self
+            for code, cmd in self._flash_pending.items():
+                if code not in self._flash_dirty:
+                    continue
+                if code == FlashDataSubcode.ChipSettings:
+                    cmd += self._password.encode("utf-8")
+                self._write_raw(bytes((0xb1, code)) + cmd)
+        finally:
+            self._flash_pending = None
+            self._flash_dirty = set()
+
+    def _build_command(self, *args:bytes) -> memoryview:
         """Internal command. Builds a command string with given elements.
 
         Parameters:
             *args(bytes): a variable number of bytes to fill command string.
 
-        Raises:
-            InvalidParameterException: if more than 64 arguments are fed.
-
         Returns:
-            bytearray: 64-byte command string.
+            memoryview: 64-byte command string.
+
+        Note:
+            The returned buffer is preallocated and shared between calls;
+            its content remains valid until the next command is built.
         """
         if len(args)>64:
-            InvalidParameterException("Too many command bytes.")
-        cmd = bytearray(64)
-        cmd[:len(args)] = args
-        return cmd
-    
-    def _read_response(self, req_code:bytes) -> list:
+            # oversized command (USB string descriptors); built on the
+            # fly as the preallocated buffer cannot be resized
+            return bytearray(args)
+        buf = self.__cmdbuf
+        buf[1:1+len(args)] = args
+        buf[1+len(args):] = self.__empty_report[len(args):]
+        return self.__cmd
+    
+    def _read_response(self, req_code:bytes) -> bytes:
         """Internal command. Reads response from device.
 
         Parameters:
@@ -227,86 +527,154 @@ class MCP2221():
             IOException: if device is not opened
 
         Returns:
-            list: device response as a list of bytes.
+            bytes: device response.
+
+        Note:
+            The device is kept in non-blocking mode; the wait is done
+            by hidapi (hid_read_timeout), which returns as soon as data
+            is available or _response_timeout has passed, without
+            toggling the device blocking mode or polling from Python.
+            The list of ints handed out by hidapi gets converted to
+            bytes once here, so downstream code slices and indexes
+            contiguous memory instead of a list of boxed integers.
         """
         if self._opened:
-            data = self.dev.read(64)
+            data = self.dev.read(64, timeout_ms = int(self._response_timeout*1000))
             if len(data) == 0:
                 raise FailedCommandException("Empty response.")
             if data[0] != req_code:
                 raise FailedCommandException("Command response code doesn't match.")
             if data[1] != 0x00:
                 raise FailedCommandException("Command failed with code {:d}.".format(data[1]))
-            return data
+            return bytes(data)
         else:
             raise IOException("Device not connected.")
 
-    def _write(self, *args:bytes) -> list:
+    def _write(self, *args:bytes) -> bytes:
         """Internal command. Writes a command to device and requests response.
-        
+
         Parameters:
             *args(bytes): a variable number of bytes to fill command string.
-        
+
         Raises:
             IOException: if device is not opened
 
         Returns:
-            list: device response as a list of bytes.
+            bytes: device response.
         """
-        if self._opened:
-            cmd = self._build_command(*args)
-            if os.name == 'nt':
-                # Windows HID requires additional prefix byte ReportID=0x00
-                # https://stackoverflow.com/questions/22240591/confused-by-the-report-id-when-using-hidapi-through-usb
-                # https://www.microchip.com/forums/m887066.aspx
-                cmd.insert(0, 0x00)
-            self.dev.write(cmd)
-            self.dev.set_nonblocking(False)
-            data = self._read_response(args[0])
-            self.dev.set_nonblocking(True)
-            return data
-        else:
-            raise IOException("Device not connected.")
-        
-    #############################
-    # General support functions #
-    #############################
-    def __not(self, value:int) -> int:
-        """Private command. An implementation of boolean 'not' on bytes.
+        if self._status_cache is not None:
+            cacheable = (len(args) == 1 and args[0] in self.__snapshot_codes) \
+                        or (len(args) == 2 and args[0] == 0xb0)
+            if cacheable:
+                # flash reads get keyed by subcode as well
+                if args not in self._status_cache:
+                    self._status_cache[args] = self.__transfer(*args)
+                return self._status_cache[args]
+            # command may change device state => drop cached responses
+            self._status_cache.clear()
+        return self.__transfer(*args)
+
+    def _write_raw(self, payload:bytes) -> bytes:
+        """Internal command. Writes an already assembled command to device
+        and requests response. Callers holding a complete payload skip
+        the per-byte unpacking and buffer fill of _write.
 
         Parameters:
-            value(int): the value to invert
-        
+            payload(bytes): complete command, starting with the command
+                            code; padded with zeros to 64 bytes if shorter.
+
+        Raises:
+            IOException: if device is not opened
+
         Returns:
-            int: boolean 'not' of input value (~value).
+            bytes: device response.
         """
-        v = [0 if b=='1' else 1 for b in reversed("{:08b}".format(value))]
-        return sum([v[n] << n for n in range(8)])
-    
-    def __and(self, v1:int, v2:int) -> int:
-        """Private command. An implementation of boolean 'and' on bytes.
+        if self._status_cache is not None:
+            # command may change device state => drop cached responses
+            self._status_cache.clear()
+        if len(payload) < 64:
+            payload = bytes(payload).ljust(64, b'\x00')
+        report = b'\x00' + payload if _IS_WINDOWS else bytes(payload)
+        return self.__send(payload[0], report)
+
+    def __transfer(self, *args:bytes) -> bytes:
+        """Private command. Performs the actual HID transaction for _write.
 
         Parameters:
-            v1(int): first operand
-            v2(int): second operand
-        
+            *args(bytes): a variable number of bytes to fill command string.
+
+        Raises:
+            IOException: if device is not opened
+            IOException: if device disappeared during transfer
+
         Returns:
-            int: boolean 'and' of inputs (v1 & v2).
-        """
-        return int.from_bytes([v1], "big") & int.from_bytes([v2], "big")
-    
-    def __or(self, v1:int, v2:int) -> int:
-        """Private command. An implementation of boolean 'or' on bytes.
+            bytes: device response.
+
+        Note:
+            The handle opened with open() is trusted until an I/O error
+            occurs; no connectivity check is made before each transfer.
+            On error, the device is marked as closed and must be
+            re-opened with open().
+            Short commands (two bytes or less) are fully determined by
+            their arguments, so their built reports get cached and
+            reused on subsequent transfers.
+        """
+        report = self.__report_cache.get(args) if len(args) <= 2 else None
+        if report == None:
+            cmd = self._build_command(*args)
+            # immutable copy at the hidapi boundary, as the command
+            # buffer gets reused for the next command
+            if _IS_WINDOWS:
+                # Windows HID requires additional prefix byte ReportID=0x00,
+                # kept permanently at the head of the command buffer
+                # https://stackoverflow.com/questions/22240591/confused-by-the-report-id-when-using-hidapi-through-usb
+                # https://www.microchip.com/forums/m887066.aspx
+                if cmd is self.__cmd:
+                    report = bytes(self.__cmdbuf)
+                else:
+                    # oversized command, built outside the shared buffer
+                    report = b'\x00' + cmd
+            else:
+                report = bytes(cmd)
+            if len(args) <= 2:
+                self.__report_cache[args] = report
+        return self.__send(args[0], report)
+
+    def __send(self, code:int, report:bytes) -> bytes:
+        """Private command. Sends a fully formed report and reads the response.
 
         Parameters:
-            v1(int): first operand
-            v2(int): second operand
-        
+            code(int): command code, used to check the response
+            report(bytes): complete report, including the ReportID prefix
+                           byte on Windows
+
+        Raises:
+            IOException: if device is not opened
+            IOException: if device disappeared during transfer
+
         Returns:
-            int: boolean 'or' of inputs (v1 | v2).
+            bytes: device response.
         """
-        return int.from_bytes([v1], "big") | int.from_bytes([v2], "big")
-    
+        if self._opened:
+            try:
+                self.dev.write(report)
+                data = self._read_response(code)
+            except (OSError, IOError):
+                # release the hidapi handle before marking the device
+                # closed, as close() is a no-op once _opened is False
+                try:
+                    self.dev.close()
+                except (OSError, IOError):
+                    pass
+                self._opened = False
+                raise IOException("Device disconnected during transfer.")
+            return data
+        else:
+            raise IOException("Device not connected.")
+        
+    #############################
+    # General support functions #
+    #############################
     def __bits_to_byte(self, bits: 'list[bool]') -> int:
         """Private command. Converts a list of bits to a number (byte).
 
@@ -319,7 +687,7 @@ class MCP2221():
         Note:
             Bit list is assumed to be little endian (LSB first).
         """
-        return sum([bits[n]<<n for n in range(len(bits))])
+        return _BITS_TO_BYTE[tuple(bool(b) for b in bits) + (False,)*(8-len(bits))]
     
     def __byte_to_bits(self, byte: int, length:int = 8) -> list:
         """Private command. Converts a byte to a list of bits of given length.
@@ -334,70 +702,82 @@ class MCP2221():
         Note:
             Returned list is little endian (LSB first).
         """
-        lst = list("{:08b}".format(byte))[::-1]
-        return [True if lst[n]=='1' else False for n in range(length)]
+        return list(_BYTE_TO_BITS[byte][:length])
 
     ######################################
     # Read/write flash and SRAM commands #
     ######################################
-    def _read_flash(self, code: FlashDataSubcode) -> list:
+    def _read_flash(self, code: FlashDataSubcode) -> bytes:
         """Internal command. Reads data from flash memory.
 
         Parameters:
             code(FlashDataSubcode): flash register to read from
 
         Returns:
-            list: flash register content in the form of a list of bytes
+            bytes: flash register content
+
+        Note:
+            Within a flash_batch block, the pending in-memory copy of
+            the register is returned instead of reading the device.
         """
+        if self._flash_pending is not None and code in self._flash_pending:
+            return self._flash_pending[code]
         data = self._write(0xb0, code)
         len = data[2]
         return data[4:(4+len)]
     
-    def _read_sram(self, code: SramDataSubcode) -> list:
+    def _read_sram(self, code: SramDataSubcode) -> bytes:
         """Internal command. Reads data from SRAM.
 
         Parameters:
             code(SramDataSubcode): memory register to read from
         
         Returns:
-            list: memory register content in the form of a list of bytes
+            bytes: memory register content
         """
         data = self._write(0x61)
-        if code == SramDataSubcode.ChipSettings:
-            p0 = 4
-            len = data[2]
-        elif code == SramDataSubcode.GPSettings:
+        p0, len_idx = _SRAM_OFFSETS[code]
+        if p0 == None:
             p0 = data[2] + 4
-            len = data[3]
-        return data[p0:(p0+len)]
+        return data[p0:(p0 + data[len_idx])]
     
-    def _write_sram(self, code:SramDataSubcode, byte:int, value:int) -> None:
+    def _write_sram(self, code:SramDataSubcode, byte:int, value:int, gp_state:tuple = None) -> None:
         """Internal command. Writes one byte to a SRAM register.
 
         Parameters:
             code(SramDataSubcode): memory register to write to
             byte(int): index of byte to write
             value(int): value to write
+            gp_state(tuple): pre-fetched (0x51 GPIO bytes, SRAM GP register)
+                             pair; if given, the two read round-trips are
+                             skipped (default None)
+
+        Note:
+            The GPIO state snapshot is only fetched for GPSettings
+            writes; ChipSettings writes don't set the alter-GP flag
+            and the GP bytes are ignored by the device, so the two
+            read round-trips would be wasted.
         """
-        # reads GPIO directions/values with command 0x51 and rearranges
-        gp_set = self._write(0x51)[2:10]
-        # read SRAM for alternate pin functions
-        gp_sram_set = self._read_sram(SramDataSubcode.GPSettings)
         cmd = bytearray(64)
         cmd[0] = 0x60
-        # set GPIO directions/values if these are relevant
-        for n in range(4):
-            if gp_set[2*n] <= 1:
-                cmd[8+n] = (gp_set[2*n] << 4) + (gp_set[2*n+1] << 3)
-            else:
-                cmd[8+n] = gp_sram_set[n]
-        
         if code == SramDataSubcode.ChipSettings:
             idx = 2 + byte
         elif code == SramDataSubcode.GPSettings:
+            if gp_state == None:
+                # reads GPIO directions/values with command 0x51 and rearranges
+                gp_state = (self._write(0x51)[2:10],
+                            self._read_sram(SramDataSubcode.GPSettings))
+            # 0x51 snapshot and SRAM register with alternate pin functions
+            gp_set, gp_sram_set = gp_state
+            # set GPIO directions/values if these are relevant
+            for n in range(4):
+                if gp_set[2*n] <= 1:
+                    cmd[8+n] = (gp_set[2*n] << 4) + (gp_set[2*n+1] << 3)
+                else:
+                    cmd[8+n] = gp_sram_set[n]
             idx = 8 + byte
             cmd[7] = 0x80
-        
+
         cmd[idx] = value
         self._write(*cmd)
 
@@ -419,6 +799,33 @@ class MCP2221():
             if bit not in range(8):
                 InvalidParameterException("Invalid bit index.")
         
+    def _patch_flash_bytes(self, code:FlashDataSubcode, byte:int, values:bytes) -> None:
+        """Internal command. Replaces consecutive bytes of a flash register,
+        preserving the rest of the register content.
+
+        Parameters:
+            code(FlashDataSubcode): flash register to write to
+            byte(int): index of first byte to replace
+            values(bytes): replacement values
+
+        Note:
+            Honors flash_batch blocks and skip_noop_flash_writes, like
+            the bit-level writer.
+        """
+        data = bytearray(self._read_flash(code))
+        changed = bytes(data[byte:byte+len(values)]) != bytes(values)
+        data[byte:byte+len(values)] = values
+        if self._flash_pending is not None:
+            self._flash_pending[code] = data
+            if changed:
+                self._flash_dirty.add(code)
+            return
+        if self.skip_noop_flash_writes and not changed:
+            return
+        if code == FlashDataSubcode.ChipSettings:
+            data += self._password.encode("utf-8")
+        self._write_raw(bytes((0xb1, code)) + data)
+
     def _read_flash_byte(self, code:FlashDataSubcode, byte:int, bits:'list[int]') -> list:
         """Internal command. Reads some bits from a register byte in flash memory.
 
@@ -431,8 +838,8 @@ class MCP2221():
             list: the values of the requested bits in the form of a list.
         """
         self.__check_mem_access_parameters(byte, bits)
-        ret = self._read_flash(code)
-        return [bool((ret[byte]>>bit) & 0x01) for bit in bits]
+        ret = _BYTE_TO_BITS[self._read_flash(code)[byte]]
+        return [ret[bit] for bit in bits]
     
     def _write_flash_byte(self, code:FlashDataSubcode, byte:int, bits:'list[int]', values:'list[bool]') -> None:
         """Internal command. Writes some bits to a register byte in flash memory.
@@ -442,15 +849,29 @@ class MCP2221():
             byte(int): index of byte to write to
             bits(list[int]): a list of bits indices to write to
             values(list[bool]): a list of values to write
+
+        Note:
+            If the requested bits already hold the requested values and
+            skip_noop_flash_writes is set, no command is issued; this
+            saves a USB transaction and a flash program cycle.
+            Within a flash_batch block, the write is applied to the
+            pending in-memory copy and flushed when the block exits.
         """
         self.__check_mem_access_parameters(byte, bits)
-        cmd = self._read_flash(code)
+        cmd = bytearray(self._read_flash(code))
+        init = cmd[byte]
         for bit,value in zip(bits, values):
-            cmd[byte] = self.__and(cmd[byte], self.__not(1<<bit))
-            cmd[byte] = self.__or(cmd[byte], 1<<bit if value else 0)
+            cmd[byte] = (cmd[byte] & ~(1<<bit) & 0xff) | (1<<bit if value else 0)
+        if self._flash_pending is not None:
+            self._flash_pending[code] = cmd
+            if cmd[byte] != init:
+                self._flash_dirty.add(code)
+            return
+        if self.skip_noop_flash_writes and cmd[byte] == init:
+            return
         if code == FlashDataSubcode.ChipSettings:
             cmd += self._password.encode("utf-8")
-        self._write(0xb1, code, *cmd)
+        self._write_raw(bytes((0xb1, code)) + cmd)
     
     def _read_sram_byte(self, code:SramDataSubcode, byte:int, bits:'list[int]') -> list:
         """Internal command. Reads some bits from a register byte in SRAM.
@@ -464,23 +885,45 @@ class MCP2221():
             list: the values of the requested bits in the form of a list.
         """
         self.__check_mem_access_parameters(byte, bits)
-        ret = self._read_sram(code)
-        return [bool((ret[byte]>>bit) & 0x01) for bit in bits]
-    
-    def __get_mem_read_function(self, mem:MemoryType):
-        """Private command. Gets appropriate memory access function.
+        ret = _BYTE_TO_BITS[self._read_sram(code)[byte]]
+        return [ret[bit] for bit in bits]
+
+    def _read_flash_packed(self, code:FlashDataSubcode, byte:int, mask:int, shift:int = 0) -> int:
+        """Internal command. Reads a packed bit field from a register byte
+        in flash memory.
 
         Parameters:
-            mem(MemoryType): enum code for memory type (flash or SRAM)
-        
+            code(FlashDataSubcode): flash register to read from
+            byte(int): index of byte to read from
+            mask(int): bit mask of the field within targeted byte
+            shift(int): position of the field's lowest bit (default 0)
+
         Returns:
-            method: the appropriate function to read from requested memory.
+            int: the value of the requested field.
+
+        Note:
+            Unlike _read_flash_byte, the field is returned as an already
+            packed integer; multi-bit settings get extracted with two
+            integer operations instead of a round trip through a bit list.
         """
-        if mem == None: mem = self._mem_target
-        if mem == MemoryType.SRAM:
-            return self._read_sram_byte
-        elif mem == MemoryType.Flash:
-            return self._read_flash_byte
+        self.__check_mem_access_parameters(byte, ())
+        return (self._read_flash(code)[byte] & mask) >> shift
+
+    def _read_sram_packed(self, code:SramDataSubcode, byte:int, mask:int, shift:int = 0) -> int:
+        """Internal command. Reads a packed bit field from a register byte
+        in SRAM.
+
+        Parameters:
+            code(SramDataSubcode): memory register to read from
+            byte(int): index of byte to read from
+            mask(int): bit mask of the field within targeted byte
+            shift(int): position of the field's lowest bit (default 0)
+
+        Returns:
+            int: the value of the requested field.
+        """
+        self.__check_mem_access_parameters(byte, ())
+        return (self._read_sram(code)[byte] & mask) >> shift
 
     def get_default_memory_target(self) -> MemoryType:
         """Gets default memory target.
@@ -509,7 +952,7 @@ class MCP2221():
         Returns:
             bool: value of CDC serial number enumeration enable bit.
         """
-        return self._read_flash_byte(FlashDataSubcode.ChipSettings, 0, [7])[0]
+        return bool(self._read_flash_packed(FlashDataSubcode.ChipSettings, 0, 0x80))
     
     def write_cdc_sn_enumeration_enable(self, value:bool) -> None:
         """Writes CDC serial number enumeration enable bit to flash memory.
@@ -529,7 +972,7 @@ class MCP2221():
         Returns:
             bool: value of UART RX LED idle signal level.
         """
-        return self._read_flash_byte(FlashDataSubcode.ChipSettings, 0, [6])[0]
+        return bool(self._read_flash_packed(FlashDataSubcode.ChipSettings, 0, 0x40))
 
     def write_led_idle_uart_rx_level(self, value:bool) -> None:
         """Writes idle level for UART RX LED signal. This is the value given
@@ -549,7 +992,7 @@ class MCP2221():
         Returns:
             bool: value of UART TX LED idle signal level.
         """
-        return self._read_flash_byte(FlashDataSubcode.ChipSettings, 0, [5])[0]
+        return bool(self._read_flash_packed(FlashDataSubcode.ChipSettings, 0, 0x20))
 
     def write_led_idle_uart_tx_level(self, value:bool) -> None:
         """Writes idle level for UART TX LED signal. This is the value given
@@ -569,7 +1012,7 @@ class MCP2221():
         Returns:
             bool: value of I2C LED idle signal level.
         """
-        return self._read_flash_byte(FlashDataSubcode.ChipSettings, 0, [4])[0]
+        return bool(self._read_flash_packed(FlashDataSubcode.ChipSettings, 0, 0x10))
 
     def write_led_idle_i2c_level(self, value:bool) -> None:
         """Writes idle level for I2C LED signal. This is the value given
@@ -589,7 +1032,7 @@ class MCP2221():
         Returns:
             bool: value of suspend mode signal level.
         """
-        return self._read_flash_byte(FlashDataSubcode.ChipSettings, 0, [3])[0]
+        return bool(self._read_flash_packed(FlashDataSubcode.ChipSettings, 0, 0x08))
 
     def write_suspend_mode_logic_level(self, value:bool) -> None:
         """Writes pin level for suspend mode signal. This is the value given
@@ -609,7 +1052,7 @@ class MCP2221():
         Returns:
             bool: level of 'USB configured' signal.
         """
-        return self._read_flash_byte(FlashDataSubcode.ChipSettings, 0, [2])[0]
+        return bool(self._read_flash_packed(FlashDataSubcode.ChipSettings, 0, 0x04))
 
     def write_usb_configured_logic_level(self, value:bool) -> None:
         """Writes level for 'USB configured' signal. This is the value given
@@ -628,8 +1071,7 @@ class MCP2221():
         Returns:
             SecurityOption: enum code for security option.
         """
-        ret = self._read_flash_byte(FlashDataSubcode.ChipSettings, 0, [0, 1])
-        return SecurityOption(self.__bits_to_byte(ret))
+        return SecurityOption(self._read_flash_packed(FlashDataSubcode.ChipSettings, 0, 0b00000011))
 
     def write_security_option(self, value:SecurityOption) -> None:
         """Writes chip security option.
@@ -653,9 +1095,8 @@ class MCP2221():
         Returns:
             ClockFrequency: enum code for clock output frequency.
         """
-        fct = self.__get_mem_read_function(mem)
-        ret = fct(FlashDataSubcode.ChipSettings, 1, [0, 1, 2])
-        return ClockFrequency(self.__bits_to_byte(ret))
+        fct = self.__mem_packed_readers[self._mem_target if mem == None else mem]
+        return ClockFrequency(fct(FlashDataSubcode.ChipSettings, 1, 0b00000111))
 
     def write_clock_output_frequency(self, value:ClockFrequency, mem:MemoryType = None) -> None:
         """Writes clock output frequency. This is the frequency of clock output
@@ -667,7 +1108,7 @@ class MCP2221():
         """
         if mem == None: mem = self._mem_target
         if mem == MemoryType.SRAM:
-            init = self.__and(self._read_sram(SramDataSubcode.ChipSettings)[1], 0b00011000)
+            init = self._read_sram(SramDataSubcode.ChipSettings)[1] & 0b00011000
             self._write_sram(SramDataSubcode.ChipSettings, 0, value + 0x80 + init)
         elif mem == MemoryType.Flash:
             self._write_flash_byte(FlashDataSubcode.ChipSettings, 1, [0, 1, 2], self.__byte_to_bits(value, 3))
@@ -684,9 +1125,8 @@ class MCP2221():
         Returns:
             ClockDutyCycle: enum code for clock duty cycle.
         """
-        fct = self.__get_mem_read_function(mem)
-        ret = fct(FlashDataSubcode.ChipSettings, 1, [3, 4])
-        return ClockDutyCycle(self.__bits_to_byte(ret))
+        fct = self.__mem_packed_readers[self._mem_target if mem == None else mem]
+        return ClockDutyCycle(fct(FlashDataSubcode.ChipSettings, 1, 0b00011000, 3))
 
     def write_clock_output_duty_cycle(self, value:ClockDutyCycle, mem:MemoryType = None) -> None:
         """Writes clock output duty cycle. This is the duty cycle of clock output
@@ -698,7 +1138,7 @@ class MCP2221():
         """
         if mem == None: mem = self._mem_target
         if mem == MemoryType.SRAM:
-            init = self.__and(self._read_sram(SramDataSubcode.ChipSettings)[1], 0b00000111)
+            init = self._read_sram(SramDataSubcode.ChipSettings)[1] & 0b00000111
             self._write_sram(SramDataSubcode.ChipSettings, 0, (value<<3) + 0x80 + init)
         elif mem == MemoryType.Flash:
             self._write_flash_byte(FlashDataSubcode.ChipSettings, 1, [3, 4], self.__byte_to_bits(value, 2))
@@ -712,7 +1152,7 @@ class MCP2221():
             int: USB vendor ID.
         """
         ret = self._read_flash(FlashDataSubcode.ChipSettings)
-        return ret[4] | (ret[5] << 8)
+        return _U16LE(ret, 4)[0]
     
     def write_usb_vid(self, value:int) -> None:
         """Writes USB vendor ID to flash memory.
@@ -720,10 +1160,8 @@ class MCP2221():
         Parameters:
             value(int): USB vendor ID
         """
-        ret = self._read_flash(FlashDataSubcode.ChipSettings)
-        ret[4] = value & 0xff
-        ret[5] = value >> 8
-        self._write(0xb1, FlashDataSubcode.ChipSettings, *ret)
+        self._patch_flash_bytes(FlashDataSubcode.ChipSettings, 4,
+                                bytes((value & 0xff, value >> 8)))
     
     usb_vid = property(read_usb_vid, write_usb_vid)
 
@@ -734,7 +1172,7 @@ class MCP2221():
             int: USB product ID.
         """
         ret = self._read_flash(FlashDataSubcode.ChipSettings)
-        return ret[6] | (ret[7] << 8)
+        return _U16LE(ret, 6)[0]
     
     def write_usb_pid(self, value:int) -> None:
         """Writes USB product ID to flash memory.
@@ -742,10 +1180,8 @@ class MCP2221():
         Parameters:
             value(int): USB product ID
         """
-        ret = self._read_flash(FlashDataSubcode.ChipSettings)
-        ret[6] = value & 0xff
-        ret[7] = value >> 8
-        self._write(0xb1, FlashDataSubcode.ChipSettings, *ret)
+        self._patch_flash_bytes(FlashDataSubcode.ChipSettings, 6,
+                                bytes((value & 0xff, value >> 8)))
     
     usb_pid = property(read_usb_pid, write_usb_pid)
 
@@ -755,7 +1191,7 @@ class MCP2221():
         Returns:
             bool: value of 'USB self-powered' attribute.
         """
-        return self._read_flash_byte(FlashDataSubcode.ChipSettings, 8, [6])[0]
+        return bool(self._read_flash_packed(FlashDataSubcode.ChipSettings, 8, 0x40))
     
     def write_usb_self_powered_attribute(self, value:bool) -> None:
         """Writes 'USB self-powered' attribute.
@@ -773,7 +1209,7 @@ class MCP2221():
         Returns:
             bool: value of 'USB remote wake-up' attribute.
         """
-        return self._read_flash_byte(FlashDataSubcode.ChipSettings, 8, [5])[0]
+        return bool(self._read_flash_packed(FlashDataSubcode.ChipSettings, 8, 0x20))
     
     def write_usb_remote_wake_up_attribute(self, value:bool) -> None:
         """Writes 'USB remote wake-up' attribute.
@@ -798,13 +1234,58 @@ class MCP2221():
 
         Parameters:
             value(int): value of USB current in enumeration phase, in mA
+
+        Raises:
+            InvalidParameterException: if value is below 0 or above 510
         """
-        ret = self._read_flash(FlashDataSubcode.ChipSettings)
-        ret[9] = int(value/2)
-        self._write(0xb1, FlashDataSubcode.ChipSettings, *ret)
-    
+        if value < 0 or value > 510:
+            raise InvalidParameterException("USB current must be between 0 and 510 mA.")
+        self._patch_flash_bytes(FlashDataSubcode.ChipSettings, 9,
+                                bytes((value >> 1,)))
+
     usb_current = property(read_usb_current, write_usb_current)
 
+    def write_flash_chip_settings(self, settings:dict) -> None:
+        """Writes several chip settings to flash memory at once.
+        Settings are given by property name; the register is read once,
+        all requested fields are applied in memory and written back with
+        a single command, instead of one read-modify-write cycle per
+        property.
+
+        Parameters:
+            settings(dict): setting name => value; valid names are the
+                            single-register chip settings property names
+                            (security_option, clock_output_frequency,
+                            led_idle_uart_rx_level, ...) together with
+                            usb_vid, usb_pid and usb_current
+
+        Raises:
+            InvalidParameterException: if a key doesn't name a chip setting
+            InvalidParameterException: if usb_current is out of range
+
+        Example:
+            mcp.write_flash_chip_settings({"usb_vid": 0x04d8,
+                                           "usb_current": 100,
+                                           "led_idle_i2c_level": True})
+        """
+        data = bytearray(self._read_flash(FlashDataSubcode.ChipSettings))
+        for name, value in settings.items():
+            if name in _CHIP_SETTING_FIELDS:
+                byte, mask, shift = _CHIP_SETTING_FIELDS[name]
+                data[byte] = (data[byte] & ~mask & 0xff) | ((int(value) << shift) & mask)
+            elif name == "usb_vid":
+                data[4:6] = (value & 0xff, value >> 8)
+            elif name == "usb_pid":
+                data[6:8] = (value & 0xff, value >> 8)
+            elif name == "usb_current":
+                if value < 0 or value > 510:
+                    raise InvalidParameterException("USB current must be between 0 and 510 mA.")
+                data[9] = value >> 1
+            else:
+                raise InvalidParameterException("Unknown chip setting '{:s}'.".format(name))
+        data += self._password.encode("utf-8")
+        self._write_raw(bytes((0xb1, FlashDataSubcode.ChipSettings)) + data)
+
     ###################
     # USB descriptors #
     ###################
@@ -828,8 +1309,11 @@ class MCP2221():
             raise InvalidParameterException("Descriptor too long.")
         if len(value)<30:
             value += "\0"
-        bval = value.encode("utf-16")
-        self._write(0xb1, code, len(bval), 0x03, *bval)
+        # explicit little-endian encoding with explicit byte order mark;
+        # encode("utf-16") would pick the host byte order, and the
+        # single-buffer write avoids unpacking ~60 bytes as arguments
+        bval = b'\xff\xfe' + value.encode("utf-16-le")
+        self._write_raw(bytes((0xb1, code, len(bval), 0x03)) + bval)
 
     def _read_usb_descriptor(self, code: FlashDataSubcode) -> str:
         """Internal command. Reads USB descriptor from flash memory.
@@ -850,9 +1334,17 @@ class MCP2221():
                             raise InvalidParameterException("Invalid descriptor code.")
         data = self._read_flash(code)
         if (len(data)<60):
-            return bytes(data[:-2]).decode('utf-16')
-        else:
-            return bytes(data).decode('utf-16')
+            data = data[:-2]
+        # descriptors are stored little endian with a leading byte order
+        # mark; skipping the marker and decoding UTF-16LE directly avoids
+        # re-detecting the byte order on every read
+        if data[:2] == b'\xff\xfe':
+            data = data[2:]
+        if not any(data[1::2]):
+            # all high bytes are zero => code points below 0x100, which
+            # map one-to-one onto latin-1
+            return data[::2].decode('latin-1')
+        return data.decode('utf-16-le')
 
     def read_usb_manufacturer_descriptor(self) -> str:
         """Reads USB manufacturer descriptor from flash memory.
@@ -981,8 +1473,8 @@ class MCP2221():
         Returns:
             bool: value of interrupt on falling edge flag (True = active).
         """
-        fct = self.__get_mem_read_function(mem)
-        return fct(FlashDataSubcode.ChipSettings, 3, [6])[0]
+        fct = self.__mem_packed_readers[self._mem_target if mem == None else mem]
+        return bool(fct(FlashDataSubcode.ChipSettings, 3, 0x40))
     
     def write_interrupt_on_falling_edge(self, value:bool, mem:MemoryType = None) -> None:
         """Writes interrupt on falling edge flag. This sets the state of interrupt
@@ -1010,8 +1502,8 @@ class MCP2221():
         Returns:
             bool: value of interrupt on rising edge flag (True = active).
         """
-        fct = self.__get_mem_read_function(mem)
-        return fct(FlashDataSubcode.ChipSettings, 3, [5])[0]
+        fct = self.__mem_packed_readers[self._mem_target if mem == None else mem]
+        return bool(fct(FlashDataSubcode.ChipSettings, 3, 0x20))
     
     def write_interrupt_on_rising_edge(self, value:bool, mem:MemoryType = None) -> None:
         """Writes interrupt on rising edge flag. This sets the state of interrupt
@@ -1029,6 +1521,36 @@ class MCP2221():
     
     interrupt_on_rising_edge = property(read_interrupt_on_rising_edge, write_interrupt_on_rising_edge)
 
+    def write_interrupt_on_edges(self, falling:bool = None, rising:bool = None, mem:MemoryType = None) -> None:
+        """Writes interrupt detection flags for both edges with a single
+        command, instead of one command per edge.
+
+        Parameters:
+            falling(bool): value of interrupt on falling edge flag, or
+                           None to keep the current setting
+            rising(bool): value of interrupt on rising edge flag, or
+                          None to keep the current setting
+            mem(MemoryType): enum code for memory type (flash or SRAM)
+        """
+        if mem == None: mem = self._mem_target
+        if mem == MemoryType.SRAM:
+            # each edge has its own alter-enable bit, hence flags left
+            # to None remain untouched by the device
+            value = 0x80
+            if falling != None:
+                value |= 0b00011000 if falling else 0b00010000
+            if rising != None:
+                value |= 0b00000110 if rising else 0b00000100
+            self._write_sram(SramDataSubcode.ChipSettings, 4, value)
+        elif mem == MemoryType.Flash:
+            bits, values = [], []
+            if falling != None:
+                bits.append(6); values.append(falling)
+            if rising != None:
+                bits.append(5); values.append(rising)
+            if len(bits)>0:
+                self._write_flash_byte(FlashDataSubcode.ChipSettings, 3, bits, values)
+
     def read_interrupt_flag(self) -> bool:
         """Reads flag telling whether an interrupt occurred.
 
@@ -1092,8 +1614,7 @@ class MCP2221():
         Returns:
             int: requested I2C transfer length.
         """
-        data = self._write(0x10)[9:11]
-        return data[0] + (data[1] << 8)
+        return _U16LE(self._write(0x10), 9)[0]
     
     @property
     def i2c_already_transferred_length(self) -> int:
@@ -1103,8 +1624,7 @@ class MCP2221():
         Returns:
             int: amount of already transferred I2C bytes.
         """
-        data = self._write(0x10)[11:13]
-        return data[0] + (data[1] << 8)
+        return _U16LE(self._write(0x10), 11)[0]
     
     @property
     def i2c_internal_buffer_counter(self) -> int:
@@ -1122,8 +1642,7 @@ class MCP2221():
         Returns:
             int: I2C slave address being used.
         """
-        data = self._write(0x10)[16:18]
-        return data[0] + (data[1] << 8)
+        return _U16LE(self._write(0x10), 16)[0]
     
     @property
     def i2c_scl_state(self) -> bool:
@@ -1181,9 +1700,15 @@ class MCP2221():
         while rem_bytes>0:
             chunk_len = min(rem_bytes, 60)
             chunk = data[dlen-rem_bytes:dlen-rem_bytes+chunk_len]
+            retries = 0
             while True:
                 ret = self._write(i2c_mode, dlen & 0xff, dlen>>8, address<<1, *chunk)
                 if ret[1] == 0: break
+                # chip still busy with the previous chunk; yield first,
+                # then back off instead of hammering the endpoint while
+                # the engine is arbitrating
+                retries += 1
+                time.sleep(0 if retries < 10 else 0.0005)
             rem_bytes -= chunk_len
 
     def i2c_read_data(self, address:int, length:int, i2c_mode:I2CMode = I2CMode.Start) -> bytearray:
@@ -1200,17 +1725,28 @@ class MCP2221():
         self._check_i2c_parameters(address, length)
         if i2c_mode == I2CMode.NoStop:
             raise InvalidParameterException("I2C mode No Stop not available for read.")
+        # request the whole transfer once; the chip keeps the transfer
+        # state and streams the data back in 60-byte chunks through the
+        # 0x40 command, so re-issuing the request per chunk only wastes
+        # a USB round-trip
+        while True:
+            ret = self._write(i2c_mode+1, length & 0xff, length>>8, address<<1 | 0x01)
+            if ret[1] == 0: break
         result = bytearray()
+        polls = 0
         while len(result)<length:
-            while True:
-                ret = self._write(i2c_mode+1, length & 0xff, length>>8, address<<1 | 0x01)
-                if ret[1] == 0: break
             ret = self._write(0x40)
             if ret[1] == 0x41:
                 raise FailedCommandException("Error reading from I2C slave.")
             if ret[3] == 0x7f:
                 raise FailedCommandException("Error issued by I2C slave.")
-            result += bytearray(ret[4:4+ret[3]])
+            if ret[3] == 0 or ret[3] > 60:
+                # chunk not buffered yet; yield first, then back off to
+                # avoid saturating the bus with empty polls
+                polls += 1
+                time.sleep(0 if polls < 10 else 0.0005)
+                continue
+            result += ret[4:4+ret[3]]
         return result
     
     #################
@@ -1238,7 +1774,7 @@ class MCP2221():
             bool: pin power-up value.
         """
         self.__check_gpio_pin_index(gpio_num)
-        return self._read_flash_byte(FlashDataSubcode.GPSettings, gpio_num, [4])[0]
+        return bool(self._read_flash_packed(FlashDataSubcode.GPSettings, gpio_num, 0x10))
     
     def gpio_write_powerup_value(self, gpio_num:int, value:bool) -> None:
         """Writes GPIO pin power-up value to flash memory.
@@ -1265,7 +1801,7 @@ class MCP2221():
             GPIODirection: pin power-up direction code.
         """
         self.__check_gpio_pin_index(gpio_num)
-        return GPIODirection(self._read_flash_byte(FlashDataSubcode.GPSettings, gpio_num, [3])[0])
+        return GPIODirection(self._read_flash_packed(FlashDataSubcode.GPSettings, gpio_num, 0x08, 3))
     
     def gpio_write_powerup_direction(self, gpio_num:int, value:GPIODirection) -> None:
         """Writes GPIO pin power-up direction to flash memory.
@@ -1285,12 +1821,40 @@ class MCP2221():
             self.gpio3_write_function(GPIO3Function.GPIO, MemoryType.Flash)
         self._write_flash_byte(FlashDataSubcode.GPSettings, gpio_num, [3], [value])
 
+    def write_flash_gpio_settings(self, settings:dict) -> None:
+        """Writes function, power-up direction and power-up value of
+        several GPIO pins to flash memory, using a single Write Flash
+        Data command. This saves USB traffic and flash program cycles
+        compared with writing each setting separately.
+
+        Parameters:
+            settings(dict): pin index => (function, direction, value)
+                            tuples; any tuple element can be None to
+                            keep the current setting
+
+        Raises:
+            InvalidParameterException: if one pin index is below 0 or above 3
+        """
+        for pin in settings:
+            self.__check_gpio_pin_index(pin)
+        data = bytearray(self._read_flash(FlashDataSubcode.GPSettings))
+        for pin, (function, direction, value) in settings.items():
+            byte = data[pin]
+            if function != None:
+                byte = (byte & 0xf8) | function
+            if direction != None:
+                byte = (byte & 0xf7) | (direction << 3)
+            if value != None:
+                byte = (byte & 0xef) | (value << 4)
+            data[pin] = byte
+        self._write_raw(bytes((0xb1, FlashDataSubcode.GPSettings)) + data)
+
     gpio0_powerup_direction = property(lambda s: s.gpio_read_powerup_direction(0), lambda s, v: s.gpio_write_powerup_direction(0, v))
     gpio1_powerup_direction = property(lambda s: s.gpio_read_powerup_direction(1), lambda s, v: s.gpio_write_powerup_direction(1, v))
     gpio2_powerup_direction = property(lambda s: s.gpio_read_powerup_direction(2), lambda s, v: s.gpio_write_powerup_direction(2, v))
     gpio3_powerup_direction = property(lambda s: s.gpio_read_powerup_direction(3), lambda s, v: s.gpio_write_powerup_direction(3, v))
 
-    def _gpio_read_function(self, gpio_num:int, mem:MemoryType = None) -> list:
+    def _gpio_read_function(self, gpio_num:int, mem:MemoryType = None) -> int:
         """Internal command. Reads GPIO pin function.
 
         Parameters:
@@ -1298,14 +1862,14 @@ class MCP2221():
             mem(MemoryType): enum code for memory type (flash or SRAM)
         
         Returns:
-            list[bool]: bit list representing GPIO pin direction value.
+            int: GPIO pin function value.
         """
         self.__check_gpio_pin_index(gpio_num)
         if mem == None: mem = self._mem_target
         if mem == MemoryType.SRAM:
-            return self._read_sram_byte(SramDataSubcode.GPSettings, gpio_num, [0, 1, 2])
+            return self._read_sram_packed(SramDataSubcode.GPSettings, gpio_num, 0b00000111)
         elif mem == MemoryType.Flash:
-            return self._read_flash_byte(FlashDataSubcode.GPSettings, gpio_num, [0, 1, 2])
+            return self._read_flash_packed(FlashDataSubcode.GPSettings, gpio_num, 0b00000111)
     
     def _gpio_write_function(self, gpio_num:int, value:int, mem:MemoryType = None) -> None:
         """Internal command. Writes GPIO pin function.
@@ -1318,18 +1882,23 @@ class MCP2221():
         self.__check_gpio_pin_index(gpio_num)
         if mem == None: mem = self._mem_target
         if mem == MemoryType.SRAM:
-            # we need to read SRAM for voltage reference settings, as they seem
-            # to be erased when any GPIO function is changed
-            vref_data = self._write(0x61)[6:8]
+            # one 0x61 read serves both the voltage reference settings (which
+            # seem to be erased when any GPIO function is changed) and the
+            # alternate pin functions needed by _write_sram
+            sram = self._write(0x61)
+            vref_data = sram[6:8]
+            gp_sram_set = sram[(sram[2]+4):(sram[2]+8)]
             # writing GPIO value/dir with 0x50 doesn't affect SRAM, so reading SRAM
             # with 0x61 doesn't tell the real value of GPIO pins unless pins are
             # assigned with 0x60; to avoid overwriting pin value/dir, we must get
             # data with 0x51
-            init = self._write(0x51)[(2+2*gpio_num):(4+2*gpio_num)]
+            gp_set = self._write(0x51)[2:10]
+            init = gp_set[(2*gpio_num):(2+2*gpio_num)]
             if init[0] <= 1:
                 value += (init[0]<<4) + (init[1]<<3)
-            
-            self._write_sram(SramDataSubcode.GPSettings, gpio_num, value)
+
+            self._write_sram(SramDataSubcode.GPSettings, gpio_num, value,
+                             (gp_set, gp_sram_set))
             # rewrite voltage reference settings
             dac_vref = 0x80 | (vref_data[0] >> 5)
             adc_vref = 0x80 | ((vref_data[1] >> 2) & 0x07)
@@ -1346,8 +1915,7 @@ class MCP2221():
         Returns:
             GPIO0Function: enum code for GPIO pin 0 function.
         """
-        ret = self._gpio_read_function(0, mem)
-        return GPIO0Function(self.__bits_to_byte(ret))
+        return GPIO0Function(self._gpio_read_function(0, mem))
     
     def gpio0_write_function(self, value: GPIO0Function, mem:MemoryType = None) -> None:
         """Writes GPIO pin 0 function.
@@ -1369,8 +1937,7 @@ class MCP2221():
         Returns:
             GPIO1Function: enum code for GPIO pin 1 function.
         """
-        ret = self._gpio_read_function(1, mem)
-        return GPIO1Function(self.__bits_to_byte(ret))
+        return GPIO1Function(self._gpio_read_function(1, mem))
     
     def gpio1_write_function(self, value: GPIO1Function, mem:MemoryType = None) -> None:
         """Writes GPIO pin 1 function.
@@ -1392,8 +1959,7 @@ class MCP2221():
         Returns:
             GPIO2Function: enum code for GPIO pin 2 function.
         """
-        ret = self._gpio_read_function(2, mem)
-        return GPIO2Function(self.__bits_to_byte(ret))
+        return GPIO2Function(self._gpio_read_function(2, mem))
     
     def gpio2_write_function(self, value: GPIO2Function, mem:MemoryType = None) -> None:
         """Writes GPIO pin 2 function.
@@ -1415,8 +1981,7 @@ class MCP2221():
         Returns:
             GPIO3Function: enum code for GPIO pin 3 function.
         """
-        ret = self._gpio_read_function(3, mem)
-        return GPIO3Function(self.__bits_to_byte(ret))
+        return GPIO3Function(self._gpio_read_function(3, mem))
     
     def gpio3_write_function(self, value: GPIO3Function, mem:MemoryType = None) -> None:
         """Writes GPIO pin 3 function.
@@ -1445,6 +2010,62 @@ class MCP2221():
         ret = self._write(0x51)
         return GPIODirection(ret[3 + pin*2])
 
+    @contextmanager
+    def gpio_batch(self):
+        """Context manager buffering GPIO writes within its block.
+        Value and direction updates issued inside the block get merged
+        and sent as a single command when the block exits, so driving
+        all four pins costs one USB transaction instead of four.
+
+        Example:
+            with mcp.gpio_batch():
+                mcp.gpio_write_value(0, True)
+                mcp.gpio_write_value(1, False) # flushed on exit
+        """
+        self._gpio_pending = {}
+        try:
+            yield self
+            pending, self._gpio_pending = self._gpio_pending, None
+            if len(pending) > 0:
+                self.gpio_write_batch(pending)
+        finally:
+            self._gpio_pending = None
+
+    def gpio_write_batch(self, updates:dict) -> None:
+        """Writes direction and/or value of several GPIO pins at once,
+        using a single HID command.
+
+        Parameters:
+            updates(dict): pin index => (direction, value) tuples; either
+                           tuple element can be None to leave the
+                           corresponding setting unchanged
+
+        Raises:
+            InvalidParameterException: if one pin index is below 0 or above 3
+
+        Note:
+            Within a gpio_batch block, updates are buffered and merged
+            into a single command sent when the block exits.
+        """
+        for pin in updates:
+            self.__check_gpio_pin_index(pin)
+        if self._gpio_pending is not None:
+            for pin, (direction, value) in updates.items():
+                prev = self._gpio_pending.get(pin, (None, None))
+                self._gpio_pending[pin] = (direction if direction != None else prev[0],
+                                           value if value != None else prev[1])
+            return
+        cmd = bytearray(18)
+        cmd[0] = 0x50
+        for pin, (direction, value) in updates.items():
+            if value != None:
+                cmd[2 + pin*4] = 0x01
+                cmd[3 + pin*4] = value
+            if direction != None:
+                cmd[4 + pin*4] = 0x01
+                cmd[5 + pin*4] = direction
+        self._write(*cmd)
+
     def gpio_write_direction(self, pin:int, mode:GPIODirection) -> None:
         """Writes GPIO pin direction.
 
@@ -1452,12 +2073,12 @@ class MCP2221():
             pin(int): GPIO pin index
             mode(GPIODirection): GPIO pin direction code
         """
+        if self._gpio_pending is not None:
+            self.gpio_write_batch({pin: (mode, None)})
+            return
         self.__check_gpio_pin_index(pin)
-        cmd = bytearray([0x50, 0x00])
-        for n in range(4):
-            cmd += bytearray([0x00, 0x00, 0x01 if pin == n else 0x00, mode if pin == n else 0x00])
-        self._write(*cmd)
-    
+        self._write_raw(_GPIO_DIRECTION_CMDS[(pin, 1 if mode else 0)])
+
     gpio0_direction = property(lambda s: s.gpio_read_direction(0), lambda s, v: s.gpio_write_direction(0, v))
     gpio1_direction = property(lambda s: s.gpio_read_direction(1), lambda s, v: s.gpio_write_direction(1, v))
     gpio2_direction = property(lambda s: s.gpio_read_direction(2), lambda s, v: s.gpio_write_direction(2, v))
@@ -1485,11 +2106,11 @@ class MCP2221():
             pin(int): GPIO pin index
             value(bool): GPIO pin value
         """
+        if self._gpio_pending is not None:
+            self.gpio_write_batch({pin: (None, value)})
+            return
         self.__check_gpio_pin_index(pin)
-        cmd = bytearray([0x50, 0x00])
-        for n in range(4):
-            cmd += bytearray([0x01 if pin == n else 0x00, value if pin == n else 0x00, 0x00, 0x00])
-        self._write(*cmd)
+        self._write_raw(_GPIO_VALUE_CMDS[(pin, 1 if value else 0)])
 
     gpio0_value = property(lambda s: s.gpio_read_value(0), lambda s, v: s.gpio_write_value(0, v))
     gpio1_value = property(lambda s: s.gpio_read_value(1), lambda s, v: s.gpio_write_value(1, v))
@@ -1508,9 +2129,8 @@ class MCP2221():
         Returns:
             ReferenceVoltageValue: enum code for reference voltage settings.
         """
-        fct = self.__get_mem_read_function(mem)
-        ret = fct(FlashDataSubcode.ChipSettings, 3, [3, 4])
-        return ReferenceVoltageValue(self.__bits_to_byte(ret))
+        fct = self.__mem_packed_readers[self._mem_target if mem == None else mem]
+        return ReferenceVoltageValue(fct(FlashDataSubcode.ChipSettings, 3, 0b00011000, 3))
     
     def write_adc_reference_voltage(self, value:ReferenceVoltageValue, mem:MemoryType = None) -> None:
         """Writes ADC reference voltage settings.
@@ -1519,14 +2139,7 @@ class MCP2221():
             mem(MemoryType): enum code for memory type (flash or SRAM)
             ReferenceVoltageValue: enum code for reference voltage settings
         """
-        if mem == None: mem = self._mem_target
-        if mem == MemoryType.SRAM:
-            # we keep bit 0 as it is reference flag and we don't want to modify it here
-            init = self.__and(self._read_sram(SramDataSubcode.ChipSettings)[3]>>2, 0b00000001)
-            # value must be on bits 1 and 2, bit 7 must be set to 1 to enable modification
-            self._write_sram(SramDataSubcode.ChipSettings, 3, (value<<1) + 0x80 + init)
-        elif mem == MemoryType.Flash:
-            self._write_flash_byte(FlashDataSubcode.ChipSettings, 3, [3, 4], self.__byte_to_bits(value, 2))
+        self.write_adc_reference(voltage = value, mem = mem)
 
     adc_reference_voltage = property(read_adc_reference_voltage, write_adc_reference_voltage)
 
@@ -1539,8 +2152,8 @@ class MCP2221():
         Returns:
             ReferenceVoltageSource: enum code for reference voltage source.
         """
-        fct = self.__get_mem_read_function(mem)
-        return ReferenceVoltageSource(fct(FlashDataSubcode.ChipSettings, 3, [2])[0])
+        fct = self.__mem_packed_readers[self._mem_target if mem == None else mem]
+        return ReferenceVoltageSource(fct(FlashDataSubcode.ChipSettings, 3, 0x04, 2))
 
     def write_adc_reference_source(self, value:ReferenceVoltageSource, mem:MemoryType = None) -> None:
         """Writes ADC reference flag.
@@ -1549,14 +2162,43 @@ class MCP2221():
             value(ReferenceVoltageSource): enum code for reference voltage source
             mem(MemoryType): enum code for memory type (flash or SRAM)
         """
+        self.write_adc_reference(source = value, mem = mem)
+
+    adc_reference_source = property(read_adc_reference_source, write_adc_reference_source)
+
+    def write_adc_reference(self, voltage:ReferenceVoltageValue = None, source:ReferenceVoltageSource = None, mem:MemoryType = None) -> None:
+        """Writes ADC reference voltage and source with a single command.
+
+        Parameters:
+            voltage(ReferenceVoltageValue): enum code for reference voltage
+                                            settings, or None to keep the
+                                            current setting
+            source(ReferenceVoltageSource): enum code for reference voltage
+                                            source, or None to keep the
+                                            current setting
+            mem(MemoryType): enum code for memory type (flash or SRAM)
+
+        Note:
+            When both fields are given, no read is needed to preserve
+            the other one, so the SRAM write costs one transaction.
+        """
         if mem == None: mem = self._mem_target
         if mem == MemoryType.SRAM:
-            init = self.__and(self._read_sram(SramDataSubcode.ChipSettings)[3] >> 2, 0b00000110)
-            self._write_sram(SramDataSubcode.ChipSettings, 3, value + 0x80 + init)
+            if voltage == None or source == None:
+                init = self._read_sram(SramDataSubcode.ChipSettings)[3] >> 2
+                if voltage == None: voltage = (init >> 1) & 0b00000011
+                if source == None: source = init & 0b00000001
+            # voltage on bits 1-2, source on bit 0, bit 7 set to 1 to
+            # enable modification
+            self._write_sram(SramDataSubcode.ChipSettings, 3, 0x80 | (voltage << 1) | source)
         elif mem == MemoryType.Flash:
-            self._write_flash_byte(FlashDataSubcode.ChipSettings, 3, [2], [value])
-    
-    adc_reference_source = property(read_adc_reference_source, write_adc_reference_source)
+            bits, values = [], []
+            if source != None:
+                bits.append(2); values.append(source)
+            if voltage != None:
+                bits += [3, 4]; values += self.__byte_to_bits(voltage, 2)
+            if len(bits)>0:
+                self._write_flash_byte(FlashDataSubcode.ChipSettings, 3, bits, values)
 
     def read_dac_reference_voltage(self, mem:MemoryType = None) -> ReferenceVoltageValue:
         """Reads DAC reference voltage settings.
@@ -1567,9 +2209,8 @@ class MCP2221():
         Returns:
             ReferenceVoltageValue: enum code for reference voltage settings.
         """
-        fct = self.__get_mem_read_function(mem)
-        ret = fct(FlashDataSubcode.ChipSettings, 2, [6, 7])
-        return ReferenceVoltageValue(self.__bits_to_byte(ret))
+        fct = self.__mem_packed_readers[self._mem_target if mem == None else mem]
+        return ReferenceVoltageValue(fct(FlashDataSubcode.ChipSettings, 2, 0b11000000, 6))
     
     def write_dac_reference_voltage(self, value:ReferenceVoltageValue, mem:MemoryType = None) -> None:
         """Writes DAC reference voltage settings.
@@ -1578,12 +2219,7 @@ class MCP2221():
             mem(MemoryType): enum code for memory type (flash or SRAM)
             ReferenceVoltageValue: enum code for reference voltage settings
         """
-        if mem == None: mem = self._mem_target
-        if mem == MemoryType.SRAM:
-            init = self.__and(self._read_sram(SramDataSubcode.ChipSettings)[2]>>5, 0b00000001)
-            self._write_sram(SramDataSubcode.ChipSettings, 1, (value<<1) + 0x80 + init)
-        elif mem == MemoryType.Flash:
-            self._write_flash_byte(FlashDataSubcode.ChipSettings, 2, [6, 7], self.__byte_to_bits(value, 2))
+        self.write_dac_reference(voltage = value, mem = mem)
 
     dac_reference_voltage = property(read_dac_reference_voltage, write_dac_reference_voltage)
 
@@ -1596,8 +2232,8 @@ class MCP2221():
         Returns:
             ReferenceVoltageSource: enum code for reference voltage source.
         """
-        fct = self.__get_mem_read_function(mem)
-        return ReferenceVoltageSource(fct(FlashDataSubcode.ChipSettings, 2, [5])[0])
+        fct = self.__mem_packed_readers[self._mem_target if mem == None else mem]
+        return ReferenceVoltageSource(fct(FlashDataSubcode.ChipSettings, 2, 0x20, 5))
 
     def write_dac_reference_source(self, value:ReferenceVoltageSource, mem:MemoryType = None) -> None:
         """Writes DAC reference flag.
@@ -1606,14 +2242,43 @@ class MCP2221():
             value(ReferenceVoltageSource): enum code for reference voltage source
             mem(MemoryType): enum code for memory type (flash or SRAM)
         """
+        self.write_dac_reference(source = value, mem = mem)
+
+    dac_reference_source = property(read_dac_reference_source, write_dac_reference_source)
+
+    def write_dac_reference(self, voltage:ReferenceVoltageValue = None, source:ReferenceVoltageSource = None, mem:MemoryType = None) -> None:
+        """Writes DAC reference voltage and source with a single command.
+
+        Parameters:
+            voltage(ReferenceVoltageValue): enum code for reference voltage
+                                            settings, or None to keep the
+                                            current setting
+            source(ReferenceVoltageSource): enum code for reference voltage
+                                            source, or None to keep the
+                                            current setting
+            mem(MemoryType): enum code for memory type (flash or SRAM)
+
+        Note:
+            When both fields are given, no read is needed to preserve
+            the other one, so the SRAM write costs one transaction.
+        """
         if mem == None: mem = self._mem_target
         if mem == MemoryType.SRAM:
-            init = self.__and(self._read_sram(SramDataSubcode.ChipSettings)[2]>>5, 0b00000110)
-            self._write_sram(SramDataSubcode.ChipSettings, 1, value + 0x80 + init)
+            if voltage == None or source == None:
+                init = self._read_sram(SramDataSubcode.ChipSettings)[2] >> 5
+                if voltage == None: voltage = (init >> 1) & 0b00000011
+                if source == None: source = init & 0b00000001
+            # voltage on bits 1-2, source on bit 0, bit 7 set to 1 to
+            # enable modification
+            self._write_sram(SramDataSubcode.ChipSettings, 1, 0x80 | (voltage << 1) | source)
         elif mem == MemoryType.Flash:
-            self._write_flash_byte(FlashDataSubcode.ChipSettings, 2, [5], [value])
-    
-    dac_reference_source = property(read_dac_reference_source, write_dac_reference_source)
+            bits, values = [], []
+            if source != None:
+                bits.append(5); values.append(source)
+            if voltage != None:
+                bits += [6, 7]; values += self.__byte_to_bits(voltage, 2)
+            if len(bits)>0:
+                self._write_flash_byte(FlashDataSubcode.ChipSettings, 2, bits, values)
 
     def read_dac_powerup_value(self) -> int:
         """Reads DAC power-up value from flash memory.
@@ -1621,8 +2286,7 @@ class MCP2221():
         Returns:
             int: DAC power-up value.
         """
-        ret = self._read_flash_byte(FlashDataSubcode.ChipSettings, 2, [0, 1, 2, 3, 4])
-        return self.__bits_to_byte(ret)
+        return self._read_flash_packed(FlashDataSubcode.ChipSettings, 2, 0b00011111)
 
     def write_dac_powerup_value(self, value:int) -> None:
         """Writes DAC power-up value to flash memory.
@@ -1646,25 +2310,96 @@ class MCP2221():
         Returns:
             int: ADC value.
         """
-        if idx not in [0, 1, 2]:
-            InvalidParameterException("Invalid ADC index.")
+        if idx < 0 or idx > 2:
+            raise InvalidParameterException("Invalid ADC index.")
         data = self._write(0x10)
-        return data[50+idx*2] | (data[51+idx*2] << 8)
+        return _U16LE(data, 50+idx*2)[0]
     
     adc0_value = property(lambda v : v.read_adc(0))
     adc1_value = property(lambda v : v.read_adc(1))
     adc2_value = property(lambda v : v.read_adc(2))
 
+    def read_adcs(self) -> list:
+        """Reads all three ADC values with a single status command,
+        instead of one command per channel.
+
+        Returns:
+            list: the three ADC values.
+        """
+        data = self._write(0x10)
+        return [_U16LE(data, 50+idx*2)[0] for idx in range(3)]
+
+    adc_values = property(read_adcs)
+
+    def poll_state(self) -> tuple:
+        """Reads all four GPIO pin values and all three ADC values with
+        two HID round-trips (one GPIO report, one status report),
+        instead of one transaction per pin or channel.
+
+        Returns:
+            tuple: (GPIO pin values, ADC values); a GPIO entry is None
+                   when the pin isn't set for GPIO operation.
+
+        Note:
+            Within a status_snapshot block, per-pin reads issued after
+            poll_state get served from the same two reports.
+        """
+        ret = self._write(0x51)
+        gpio = [None if ret[2+2*pin] == 0xee else bool(ret[2+2*pin]) for pin in range(4)]
+        data = self._write(0x10)
+        adc = [_U16LE(data, 50+idx*2)[0] for idx in range(3)]
+        return gpio, adc
+
     def write_dac(self, value:int) -> None:
         """Writes DAC value.
 
         Parameters:
             value(int): DAC value (5 bit)
         """
-        self._write_sram(SramDataSubcode.ChipSettings, 2, (value & 0x1f) + 0x80)
+        self._write_raw(_DAC_VALUE_CMDS[value & 0x1f])
 
     dac_value = property(None, write_dac)
 
+    def write_dac_sequence(self, values:'list[int]', delay:float = 0) -> None:
+        """Writes a sequence of DAC values, one command per sample. The
+        commands are prebuilt, so the output rate is only limited by the
+        USB transfer time (about 1 kS/s). Useful to generate waveforms.
+
+        Parameters:
+            values(list[int]): sequence of DAC values (5 bit each)
+            delay(float): time to wait between samples, in seconds (default 0)
+        """
+        for value in values:
+            self._write_raw(_DAC_VALUE_CMDS[value & 0x1f])
+            if delay > 0:
+                time.sleep(delay)
+
+    def write_dac_settings(self, source:ReferenceVoltageSource = None, voltage:ReferenceVoltageValue = None, value:int = None) -> None:
+        """Writes DAC reference source, reference voltage and output value
+        with a single Set SRAM Settings command, instead of one command
+        per setting. Parameters left as None keep their current value.
+
+        Parameters:
+            source(ReferenceVoltageSource): enum code for reference voltage source (default None)
+            voltage(ReferenceVoltageValue): enum code for reference voltage settings (default None)
+            value(int): DAC value, 5 bit (default None)
+
+        Note:
+            Reference source and voltage share a register byte; if only
+            one of them is given, the other is read from SRAM first.
+        """
+        cmd = bytearray(5)
+        cmd[0] = 0x60
+        if source != None or voltage != None:
+            if source == None or voltage == None:
+                init = self._read_sram(SramDataSubcode.ChipSettings)[2] >> 5
+                if source == None: source = init & 0x01
+                if voltage == None: voltage = init >> 1
+            cmd[3] = 0x80 + (voltage << 1) + source
+        if value != None:
+            cmd[4] = 0x80 + (value & 0x1f)
+        self._write(*cmd)
+
     #########
     # Other #
     #########
@@ -1673,9 +2408,15 @@ class MCP2221():
 
         Returns:
             str: chip firmware version string.
+
+        Note:
+            The version cannot change while the device is open, hence
+            it is read once per session and served from cache afterwards.
         """
-        data = self._write(0x10)
-        return bytearray(data[46:50]).decode("utf-8")
+        if self._fw_version == None:
+            data = self._write(0x10)
+            self._fw_version = data[46:50].decode("ascii")
+        return self._fw_version
     
     firmware_version = property(read_firmware_version)
 
@@ -1684,7 +2425,12 @@ class MCP2221():
         as the device descriptor will have changed.
         """
         try:
-            # this should throw an OSError as chip disconnects
+            # this should throw an IOException as chip disconnects
             self._write(0x70, 0xab, 0xcd, 0xef)
-        except OSError:
+        except IOException:
+            pass
+        except FailedCommandException:
+            # the chip never answers the reset command; if the handle
+            # isn't reported dead yet the read just comes back empty,
+            # in which case the handle must still be released here
             self.close()
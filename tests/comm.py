@@ -7,6 +7,7 @@ class TestOpenClose(unittest.TestCase):
         self.mcp = mcp2221.MCP2221()
 
     def test_open_ok(self):
+        self.mcp._response_timeout = 0 # mocked device never answers
         with patch("hid.device"):
             with self.assertRaises(FailedCommandException):
                 # since there's no real device connected, the ADC state fix
@@ -22,6 +23,21 @@ class TestOpenClose(unittest.TestCase):
     def test_open_no_path(self):
         with self.assertRaises(KeyError):
             self.mcp.open({"nopath":""})
+
+    def test_open_first_ok(self):
+        self.mcp._response_timeout = 0 # mocked device never answers
+        with patch("hid.device"):
+            with self.assertRaises(FailedCommandException):
+                # since there's no real device connected, the ADC state fix
+                # won't work => return empty response
+                self.mcp.open_first()
+            self.assertTrue(self.mcp._opened)
+            self.mcp.dev.open.assert_called_with(1240, 221)
+
+    def test_open_first_fail(self):
+        with self.assertRaises(IOException):
+            self.mcp.open_first(vendor_id=0, product_id=0)
+        self.assertFalse(self.mcp._opened)
     
     def test_close(self):
         self.mcp._opened = True
@@ -33,6 +49,7 @@ class TestOpenClose(unittest.TestCase):
 class TestHIDCommands(MCPTestCase):
     def test_read_response_fail_empty(self):
         self.mcp.dev.read.return_value = b""
+        self.mcp._response_timeout = 0 # don't poll for a response that never comes
         with self.assertRaises(mcp2221.exceptions.FailedCommandException):
             self.mcp._read_response(0x10)
     
@@ -53,15 +70,28 @@ class TestHIDCommands(MCPTestCase):
 
     def test_read_response_ok(self):
         self.mcp.dev.read.return_value = [0x10, 0x00]
-        self.assertEqual(self.mcp._read_response(0x10), self.mcp.dev.read.return_value)
+        self.assertEqual(self.mcp._read_response(0x10), bytes(self.mcp.dev.read.return_value))
 
     def test_write_ok(self):
         cmd = self.mcp._build_command(0x10)
         self.mcp.dev.read.return_value = cmd
         self.assertEqual(self.mcp._write(0x10), cmd)
     
+    def test_write_report_cached(self):
+        self.mcp.dev.read.return_value = [0x10, 0x00]
+        self.mcp._write(0x10)
+        self.mcp._write(0x10)
+        first, second = [c[0][0] for c in self.mcp.dev.write.call_args_list]
+        self.assertIs(first, second)
+
     def test_write_fail_not_open(self):
         self.mcp._opened = False
         with self.assertRaises(mcp2221.exceptions.IOException):
             self.mcp._write(0x10)
 
+    def test_write_fail_disconnected(self):
+        self.mcp.dev.write.side_effect = OSError()
+        with self.assertRaises(mcp2221.exceptions.IOException):
+            self.mcp._write(0x10)
+        self.assertFalse(self.mcp._opened)
+
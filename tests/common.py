@@ -5,12 +5,17 @@ import mcp2221
 from mcp2221.enums import *
 from mcp2221.exceptions import *
 
+# per-pin function enum classes, resolved once instead of through
+# getattr(mcp2221.enums, ...) in every test loop
+GPIO_FN_CLS = tuple(getattr(mcp2221.enums, "GPIO{:d}Function".format(pin))
+                    for pin in range(4))
+
 class MCPTestCase(unittest.TestCase):
     def setUp(self):
         # this is the kind of reply expected for 0xb0 command (read flash settings registers)
-        self.xb0_00 = [176, 0, 10, 0, 124, 18, 18, 108, 216, 4, 221, 0, 128, 50, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
+        self.xb0_00 = bytearray([176, 0, 10, 0, 124, 18, 18, 108, 216, 4, 221, 0, 128, 50, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0])
         # this is the kind of reply expected for 0x61 command (read SRAM settings registers)
-        self.x61 = [97, 0, 18, 4, 120, 18, 104, 108, 216, 4, 221, 0, 128, 50, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 8, 45, 0, 73, 0, 50, 0, 67, 0, 47, 0, 85, 0, 65, 0, 82, 0, 84, 0, 32, 0, 67, 0, 111, 0, 109, 0, 98, 0, 111, 0, 0, 0, 0, 0, 0, 0, 0, 0]
+        self.x61 = bytearray([97, 0, 18, 4, 120, 18, 104, 108, 216, 4, 221, 0, 128, 50, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 8, 45, 0, 73, 0, 50, 0, 67, 0, 47, 0, 85, 0, 65, 0, 82, 0, 84, 0, 32, 0, 67, 0, 111, 0, 109, 0, 98, 0, 111, 0, 0, 0, 0, 0, 0, 0, 0, 0])
         self.mcp = mcp2221.MCP2221()
         self.mcp.dev = Mock()
         self.mcp._opened = True
@@ -2,6 +2,10 @@ from .common import *
 
 __all__ = ["TestWriteGPIO", "TestReadGPIO"]
 
+# property names for each pin, built once instead of in every loop
+_VAL = tuple("gpio{:d}_value".format(pin) for pin in range(4))
+_DIR = tuple("gpio{:d}_direction".format(pin) for pin in range(4))
+
 class TestWriteGPIO(MCPTestWithReadMock):
     # command 0x50
     def setUp(self):
@@ -13,7 +17,7 @@ class TestWriteGPIO(MCPTestWithReadMock):
             self.mcp.gpio_write_value(pin, True)
             self.assertEqual(self.mcp.dev.write.call_args[0][0][2+pin*4], 0b1)
             self.assertEqual(self.mcp.dev.write.call_args[0][0][3+pin*4], 0b1)
-            setattr(self.mcp, "gpio{:d}_value".format(pin), True)
+            setattr(self.mcp, _VAL[pin], True)
             self.assertEqual(self.mcp.dev.write.call_args[0][0][2+pin*4], 0b1)
             self.assertEqual(self.mcp.dev.write.call_args[0][0][3+pin*4], 0b1)
 
@@ -22,10 +26,41 @@ class TestWriteGPIO(MCPTestWithReadMock):
             self.mcp.gpio_write_direction(pin, GPIODirection.Input)
             self.assertEqual(self.mcp.dev.write.call_args[0][0][4+pin*4], 0b1)
             self.assertEqual(self.mcp.dev.write.call_args[0][0][5+pin*4], 0b1)
-            setattr(self.mcp, "gpio{:d}_direction".format(pin), GPIODirection.Input)
+            setattr(self.mcp, _DIR[pin], GPIODirection.Input)
             self.assertEqual(self.mcp.dev.write.call_args[0][0][4+pin*4], 0b1)
             self.assertEqual(self.mcp.dev.write.call_args[0][0][5+pin*4], 0b1)
 
+    def test_write_gpio_batch(self):
+        self.mcp.gpio_write_batch({0: (GPIODirection.Input, True), 2: (None, False)})
+        cmd = self.mcp.dev.write.call_args[0][0]
+        self.assertEqual(cmd[2:6], b"\x01\x01\x01\x01")
+        self.assertEqual(cmd[6:10], bytes(4))
+        self.assertEqual(cmd[10:14], b"\x01\x00\x00\x00")
+        self.assertEqual(cmd[14:18], bytes(4))
+        self.assertEqual(self.mcp.dev.write.call_count, 1)
+
+    def test_write_gpio_batch_invalid_pin(self):
+        with self.assertRaises(InvalidParameterException):
+            self.mcp.gpio_write_batch({4: (GPIODirection.Input, True)})
+
+    def test_gpio_batch(self):
+        with self.mcp.gpio_batch():
+            self.mcp.gpio_write_value(0, True)
+            self.mcp.gpio_write_direction(0, GPIODirection.Input)
+            self.mcp.gpio_write_value(2, False)
+            # nothing sent while inside the block
+            self.assertEqual(self.mcp.dev.write.call_count, 0)
+        cmd = self.mcp.dev.write.call_args[0][0]
+        self.assertEqual(cmd[2:6], b"\x01\x01\x01\x01")
+        self.assertEqual(cmd[10:14], b"\x01\x00\x00\x00")
+        self.assertEqual(self.mcp.dev.write.call_count, 1)
+        self.assertEqual(self.mcp._gpio_pending, None)
+
+    def test_gpio_batch_empty(self):
+        with self.mcp.gpio_batch():
+            pass
+        self.assertEqual(self.mcp.dev.write.call_count, 0)
+
 
 class TestReadGPIO(MCPTestWithReadMock):
     # command 0x51
@@ -36,7 +71,7 @@ class TestReadGPIO(MCPTestWithReadMock):
     def test_read_gpio_value_ok(self):
         for pin in range(4):
             self.do_test_read_func_bool(self.mcp.gpio_read_value, 2+2*pin, pin)
-            self.do_test_read_prop_bool("gpio{:d}_value".format(pin), 2+2*pin)
+            self.do_test_read_prop_bool(_VAL[pin], 2+2*pin)
 
     def test_read_gpio_value_invalid(self):
         for pin in range(4):
@@ -44,10 +79,10 @@ class TestReadGPIO(MCPTestWithReadMock):
             with self.assertWarns(InvalidReturnValueWarning):
                 self.assertTrue(self.mcp.gpio_read_value(pin))
             with self.assertWarns(InvalidReturnValueWarning):
-                self.assertTrue(getattr(self.mcp, "gpio{:d}_value".format(pin)))
+                self.assertTrue(getattr(self.mcp, _VAL[pin]))
 
     def test_read_gpio_direction(self):
         for pin in range(4):
             self.do_test_read_func_bool(self.mcp.gpio_read_direction, 3+2*pin, pin)
-            self.do_test_read_prop_bool("gpio{:d}_direction".format(pin), 3+2*pin)
+            self.do_test_read_prop_bool(_DIR[pin], 3+2*pin)
 
@@ -54,7 +54,7 @@ class TestI2C(MCPTestWithReadMock):
             self.mcp._read_response.return_value[4:54] = data
             ret = self.mcp.i2c_read_data(0x7f, len(data), mode)
             self.assertEqual(ret, data)
-            self.assertEqual(self.mcp.dev.write.call_count % 10, 0) # 10 read operations
+            self.assertEqual(self.mcp.dev.write.call_count % 11, 0) # 1 setup + 10 read operations
 
 
 class TestI2CStatus(MCPTestWithReadMock):
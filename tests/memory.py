@@ -5,39 +5,97 @@ __all__ = ["TestReadWriteMemory"]
 class TestReadWriteMemory(MCPTestCase):
     def test_read_flash_ok(self):
         self.mcp.dev.read.return_value = self.xb0_00
-        self.assertEqual(self.mcp._read_flash(FlashDataSubcode.ChipSettings), self.xb0_00[4:14])
+        self.assertEqual(self.mcp._read_flash(FlashDataSubcode.ChipSettings), bytes(self.xb0_00[4:14]))
     
     def test_read_sram_ok(self):
         self.mcp.dev.read.return_value = self.x61
-        self.assertEqual(self.mcp._read_sram(SramDataSubcode.ChipSettings), self.x61[4:22])
-        self.assertEqual(self.mcp._read_sram(SramDataSubcode.GPSettings), self.x61[22:26])
+        self.assertEqual(self.mcp._read_sram(SramDataSubcode.ChipSettings), bytes(self.x61[4:22]))
+        self.assertEqual(self.mcp._read_sram(SramDataSubcode.GPSettings), bytes(self.x61[22:26]))
     
     def test_read_flash_byte_ok(self):
         self.mcp.dev.read.return_value = self.xb0_00
         for n in range(0,9):
             result = self.mcp._read_flash_byte(FlashDataSubcode.ChipSettings, n, range(8))
-            value = int("".join(["1" if x else "0" for x in reversed(result)]),2)
+            value = sum(bool(x) << i for i, x in enumerate(result))
             self.assertEqual(value, self.xb0_00[4+n])
 
     def test_read_sram_byte_ok(self):
         self.mcp.dev.read.return_value = self.x61
         for n in range(0,9):
             result = self.mcp._read_sram_byte(SramDataSubcode.ChipSettings, n, range(8))
-            value = int("".join(["1" if x else "0" for x in reversed(result)]),2)
+            value = sum(bool(x) << i for i, x in enumerate(result))
             self.assertEqual(value, self.x61[4+n])
 
+    def test_read_flash_packed_ok(self):
+        self.mcp.dev.read.return_value = self.xb0_00
+        for n in range(0,9):
+            result = self.mcp._read_flash_packed(FlashDataSubcode.ChipSettings, n, 0xff)
+            self.assertEqual(result, self.xb0_00[4+n])
+        result = self.mcp._read_flash_packed(FlashDataSubcode.ChipSettings, 0, 0b00011000, 3)
+        self.assertEqual(result, (self.xb0_00[4] >> 3) & 0x03)
+
+    def test_read_sram_packed_ok(self):
+        self.mcp.dev.read.return_value = self.x61
+        for n in range(0,9):
+            result = self.mcp._read_sram_packed(SramDataSubcode.ChipSettings, n, 0xff)
+            self.assertEqual(result, self.x61[4+n])
+        result = self.mcp._read_sram_packed(SramDataSubcode.ChipSettings, 0, 0b00011000, 3)
+        self.assertEqual(result, (self.x61[4] >> 3) & 0x03)
+
     def test_write_flash_byte_ok(self):
         # tests that 'write_flash_byte' sends the right data to hid write command
+        self.mcp.skip_noop_flash_writes = False
         xb1_00 = bytearray(64)
         xb1_00[0] = 0xb1
         with patch.object(self.mcp, "_read_response", return_value = self.xb0_00):
             for byte in range(9):
                 for bit in range(8):
                     xb1_00[2:12] = self.xb0_00[4:14]
-                    xb1_00[2+byte] = self.mcp._MCP2221__and(xb1_00[2+byte], 0xff - (1<<bit))
+                    xb1_00[2+byte] = xb1_00[2+byte] & (0xff - (1<<bit))
                     self.mcp._write_flash_byte(FlashDataSubcode.ChipSettings, byte, [bit], [False])
                     self.assertEqual(self.mcp.dev.write.call_args[0][0], xb1_00)
-        
+
+    def test_write_flash_byte_noop_skipped(self):
+        # tests that 'write_flash_byte' doesn't issue a command when the
+        # requested bits already hold the requested values
+        with patch.object(self.mcp, "_read_response", return_value = self.xb0_00):
+            for byte in range(9):
+                for bit in range(8):
+                    self.mcp.dev.write.reset_mock()
+                    value = bool((self.xb0_00[4+byte] >> bit) & 0x01)
+                    self.mcp._write_flash_byte(FlashDataSubcode.ChipSettings, byte, [bit], [value])
+                    # only the flash read command should have been sent
+                    self.assertEqual(self.mcp.dev.write.call_count, 1)
+                    self.assertEqual(self.mcp.dev.write.call_args[0][0][0], 0xb0)
+
+    def test_flash_batch(self):
+        # tests that writes within a 'flash_batch' block get coalesced
+        # into a single flash write per register
+        with patch.object(self.mcp, "_read_response", return_value = self.xb0_00):
+            with self.mcp.flash_batch():
+                self.mcp._write_flash_byte(FlashDataSubcode.ChipSettings, 0, [0], [True])
+                self.mcp._write_flash_byte(FlashDataSubcode.ChipSettings, 1, [1], [False])
+                # only the flash read command has been sent so far
+                self.assertEqual(self.mcp.dev.write.call_count, 1)
+            self.assertEqual(self.mcp.dev.write.call_count, 2)
+            cmd = self.mcp.dev.write.call_args[0][0]
+            self.assertEqual(cmd[0], 0xb1)
+            self.assertEqual(cmd[1], FlashDataSubcode.ChipSettings)
+            self.assertEqual(cmd[2], self.xb0_00[4] | 0x01)
+            self.assertEqual(cmd[3], self.xb0_00[5] & 0xfd)
+        self.assertEqual(self.mcp._flash_pending, None)
+
+    def test_flash_batch_noop(self):
+        # tests that a batch writing only already-stored values
+        # doesn't issue any flash write command
+        with patch.object(self.mcp, "_read_response", return_value = self.xb0_00):
+            with self.mcp.flash_batch():
+                value = bool(self.xb0_00[4] & 0x01)
+                self.mcp._write_flash_byte(FlashDataSubcode.ChipSettings, 0, [0], [value])
+            # only the flash read command should have been sent
+            self.assertEqual(self.mcp.dev.write.call_count, 1)
+            self.assertEqual(self.mcp.dev.write.call_args[0][0][0], 0xb0)
+
     def test_write_sram_ok(self):
         # tests that 'write_sram' sends the right data to hid write command
         with patch.object(self.mcp, "_read_response", return_value = self.x61):
@@ -1,6 +1,62 @@
 from .common import *
 
-__all__ = ["TestSendFlashAccessPassword", "TestMiscFunctions"]
+__all__ = ["TestFindDevices", "TestSendFlashAccessPassword", "TestMiscFunctions"]
+
+class TestFindDevices(unittest.TestCase):
+    def setUp(self):
+        mcp2221.invalidate_device_cache()
+        self.descriptors = [{"vendor_id": 1240, "product_id": 221, "path": b"1", "serial_number": "0001"},
+                            {"vendor_id": 1240, "product_id": 221, "path": b"2", "serial_number": "0002"},
+                            {"vendor_id": 1, "product_id": 2, "path": b"3", "serial_number": "0003"}]
+
+    def test_find_devices(self):
+        with patch("hid.enumerate", return_value=self.descriptors):
+            self.assertEqual(mcp2221.find_devices(), self.descriptors[:2])
+
+    def test_find_devices_cached(self):
+        with patch("hid.enumerate", return_value=self.descriptors) as enum:
+            mcp2221.find_devices()
+            mcp2221.find_devices()
+            self.assertEqual(enum.call_count, 1)
+
+    def test_find_devices_filters(self):
+        with patch("hid.enumerate", return_value=self.descriptors) as enum:
+            devs = mcp2221.find_devices(filters=[(1240, 221), (1, 2)])
+            self.assertEqual(devs, self.descriptors)
+            self.assertEqual(mcp2221.find_devices(filters=[(1, 2)]), [self.descriptors[2]])
+            # distinct filters are cached separately
+            self.assertEqual(enum.call_count, 2)
+
+    def test_find_devices_serial_number(self):
+        with patch("hid.enumerate", return_value=self.descriptors):
+            self.assertEqual(mcp2221.find_devices(serial_number="0002"), [self.descriptors[1]])
+            self.assertEqual(mcp2221.find_devices(serial_number="0004"), [])
+
+    def test_find_first(self):
+        with patch("hid.enumerate", return_value=self.descriptors):
+            self.assertEqual(mcp2221.find_first(), self.descriptors[0])
+
+    def test_find_first_serial_number(self):
+        with patch("hid.enumerate", return_value=self.descriptors):
+            self.assertEqual(mcp2221.find_first(serial_number="0002"), self.descriptors[1])
+            self.assertIsNone(mcp2221.find_first(serial_number="0004"))
+
+    def test_find_first_not_found(self):
+        with patch("hid.enumerate", return_value=[]):
+            self.assertIsNone(mcp2221.find_first())
+
+    def test_find_first_uses_cache(self):
+        with patch("hid.enumerate", return_value=self.descriptors) as enum:
+            mcp2221.find_devices()
+            self.assertEqual(mcp2221.find_first(), self.descriptors[0])
+            self.assertEqual(enum.call_count, 1)
+
+    def test_invalidate_device_cache(self):
+        with patch("hid.enumerate", return_value=self.descriptors) as enum:
+            mcp2221.find_devices()
+            mcp2221.invalidate_device_cache()
+            mcp2221.find_devices()
+            self.assertEqual(enum.call_count, 2)
 
 class TestSendFlashAccessPassword(MCPTestWithReadMock):
     # command 0xb2
@@ -24,4 +80,4 @@ class TestMiscFunctions(MCPTestWithReadMock):
     def test_reset_chip(self):
         self.mcp._read_response.return_value[0] = 0x70
         self.mcp.reset_chip()
-        self.assertEqual(self.mcp.dev.write.call_args[0][0][:4], bytearray([0x70, 0xab, 0xcd, 0xef]))
+        self.assertEqual(self.mcp.dev.write.call_args[0][0][:4], b"\x70\xab\xcd\xef")
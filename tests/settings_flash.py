@@ -4,6 +4,11 @@ __all__ = ["TestReadFlashChipSettings", "TestWriteFlashChipSettings",
            "TestReadFlashUSBDescriptors", "TestWriteFlashUSBDescriptors",
            "TestReadFlashGPSettings", "TestWriteFlashGPSettings"]
 
+# fixture strings: 30 characters ('@' to ']') for the USB descriptors,
+# 60 characters ('@' to '{') for the factory serial number
+_DESCR = bytes(range(64,94)).decode("latin-1")
+_SN = bytes(range(64,124)).decode("latin-1")
+
 class TestReadFlashChipSettings(MCPTestWithReadMock):
     def setUp(self):
         super().setUp()
@@ -134,6 +139,9 @@ class TestWriteFlashChipSettings(MCPTestWithReadMock):
         super().setUp()
         self.mcp._read_response.return_value[:3] = [0xb0, 0, 10]
         self.mcp.set_default_memory_target(MemoryType.Flash)
+        # command encoding is what is under test here => force writes
+        # even when they wouldn't change the stored value
+        self.mcp.skip_noop_flash_writes = False
 
     def test_write_cdc_sn_enumeration_enable(self):
         self.do_test_write_func_bit(self.mcp.write_cdc_sn_enumeration_enable, 2, 7)
@@ -201,6 +209,12 @@ class TestWriteFlashChipSettings(MCPTestWithReadMock):
         self.do_test_write_func_bit(self.mcp.write_interrupt_on_rising_edge, 5, 5)
         self.do_test_write_prop_bit("interrupt_on_rising_edge", 5, 5)
 
+    def test_write_interrupt_on_edges(self):
+        self.mcp.write_interrupt_on_edges(falling=True, rising=True)
+        self.assertEqual(self.mcp.dev.write.call_args[0][0][5], 0b01100000)
+        # one read + one write command for both bits
+        self.assertEqual(self.mcp.dev.write.call_count, 2)
+
     def test_write_adc_reference_voltage(self):
         self.mcp.write_adc_reference_voltage(ReferenceVoltageValue.Voltage2_048V)
         self.assertEqual(self.mcp.dev.write.call_args[0][0][5], 0b00010000)
@@ -213,6 +227,19 @@ class TestWriteFlashChipSettings(MCPTestWithReadMock):
         self.mcp.adc_reference_source = ReferenceVoltageSource.Vdd
         self.assertEqual(self.mcp.dev.write.call_args[0][0][5], 0b00000000)
 
+    def test_write_adc_reference(self):
+        self.mcp.write_adc_reference(ReferenceVoltageValue.Voltage4_096V,
+                                     ReferenceVoltageSource.Internal)
+        self.assertEqual(self.mcp.dev.write.call_args[0][0][5], 0b00011100)
+        # one read + one write command for both fields
+        self.assertEqual(self.mcp.dev.write.call_count, 2)
+
+    def test_write_dac_reference(self):
+        self.mcp.write_dac_reference(ReferenceVoltageValue.Voltage4_096V,
+                                     ReferenceVoltageSource.Internal)
+        self.assertEqual(self.mcp.dev.write.call_args[0][0][4], 0b11100000)
+        self.assertEqual(self.mcp.dev.write.call_count, 2)
+
     def test_write_usb_vid(self):
         self.do_test_write_func_word(self.mcp.write_usb_vid, 6)
         self.do_test_write_prop_word("usb_vid", 6)
@@ -221,6 +248,43 @@ class TestWriteFlashChipSettings(MCPTestWithReadMock):
         self.do_test_write_func_word(self.mcp.write_usb_pid, 8)
         self.do_test_write_prop_word("usb_pid", 8)
 
+    def test_write_flash_chip_settings(self):
+        self.mcp.write_flash_chip_settings({"usb_vid": 0x1234,
+                                            "usb_pid": 0xabcd,
+                                            "usb_current": 100,
+                                            "led_idle_i2c_level": True,
+                                            "security_option": SecurityOption.PasswordProtected,
+                                            "clock_output_duty_cycle": ClockDutyCycle.Percent_75})
+        cmd = self.mcp.dev.write.call_args[0][0]
+        self.assertEqual(cmd[0], 0xb1)
+        self.assertEqual(cmd[1], FlashDataSubcode.ChipSettings)
+        self.assertEqual(cmd[2], 0b00010001)
+        self.assertEqual(cmd[3], 0b00011000)
+        self.assertEqual(cmd[6:10], bytes([0x34, 0x12, 0xcd, 0xab]))
+        self.assertEqual(cmd[11], 50)
+        # one read of current settings, one write
+        self.assertEqual(self.mcp.dev.write.call_count, 2)
+
+    def test_write_usb_values_batched(self):
+        with self.mcp.flash_batch():
+            self.mcp.write_usb_vid(0x1234)
+            self.mcp.write_usb_current(100)
+            # only the initial register read was sent
+            self.assertEqual(self.mcp.dev.write.call_count, 1)
+        cmd = self.mcp.dev.write.call_args[0][0]
+        self.assertEqual(cmd[0], 0xb1)
+        self.assertEqual(cmd[6:8], bytes([0x34, 0x12]))
+        self.assertEqual(cmd[11], 50)
+        self.assertEqual(self.mcp.dev.write.call_count, 2)
+
+    def test_write_flash_chip_settings_invalid_name(self):
+        with self.assertRaises(InvalidParameterException):
+            self.mcp.write_flash_chip_settings({"nonsense": 1})
+
+    def test_write_flash_chip_settings_invalid_current(self):
+        with self.assertRaises(InvalidParameterException):
+            self.mcp.write_flash_chip_settings({"usb_current": 600})
+
     def test_write_usb_self_powered_attribute(self):
         self.do_test_write_func_bit(self.mcp.write_usb_self_powered_attribute, 10, 6)
         self.do_test_write_prop_bit("usb_self_powered_attribute", 10, 6)
@@ -235,17 +299,29 @@ class TestWriteFlashChipSettings(MCPTestWithReadMock):
         self.mcp.usb_current = 2*0x11
         self.assertEqual(self.mcp.dev.write.call_args[0][0][11], 0x11)
 
+    def test_write_usb_current_fail(self):
+        with self.assertRaises(InvalidParameterException):
+            self.mcp.write_usb_current(-2)
+        with self.assertRaises(InvalidParameterException):
+            self.mcp.write_usb_current(512)
+
 
 class TestReadFlashUSBDescriptors(MCPTestCase):
+    @classmethod
+    def setUpClass(cls):
+        # descriptor string and pre-encoded reply template are immutable
+        # => build them once for the whole class instead of per test
+        cls.descr = _DESCR
+        template = bytearray(64)
+        template[0] = 0xb0
+        template[2] = 62 # 2 + 2*30 characters (2 extra characters for endianness, by utf-16 standard)
+        template[3] = 3 # per datasheet, this byte must be 0x03
+        template[4:64] = cls.descr.encode("utf-16")
+        cls.xb0_descr = bytes(template)
+
     def setUp(self):
         super().setUp()
-        self.descr = "".join([chr(x) for x in range(64,94)])
-        xb0_0x = bytearray(64)
-        xb0_0x[0] = 0xb0
-        xb0_0x[2] = 62 # 2 + 2*30 characters (2 extra characters for endianness, by utf-16 standard)
-        xb0_0x[3] = 3 # per datasheet, this byte must be 0x03
-        xb0_0x[4:64] = self.descr.encode("utf-16")
-        self.mcp.dev.read.return_value = xb0_0x
+        self.mcp.dev.read.return_value = bytearray(self.xb0_descr)
         self.mcp.set_default_memory_target(MemoryType.Flash)
 
     def test_read_usb_manufacturer_descriptor(self):
@@ -266,8 +342,22 @@ class TestReadFlashUSBDescriptors(MCPTestCase):
         v = self.mcp.usb_serial_number_descriptor
         self.assertEqual(v, self.descr)
 
+    def test_read_usb_descriptor_non_ascii(self):
+        descr = "Føø"
+        ret = bytearray(64)
+        ret[0] = 0xb0
+        ret[2] = 10 # BOM + 3 characters + 2 extra bytes
+        ret[3] = 3
+        ret[4:12] = b"\xff\xfe" + descr.encode("utf-16-le")
+        self.mcp.dev.read.return_value = ret
+        self.assertEqual(self.mcp.read_usb_product_descriptor(), descr)
+        # code points above 0xff go through the full UTF-16LE decoder
+        descr = "T→ℝ"
+        ret[4:12] = b"\xff\xfe" + descr.encode("utf-16-le")
+        self.assertEqual(self.mcp.read_usb_product_descriptor(), descr)
+
     def test_read_usb_serial_number_descriptor(self):
-        sn = "".join([chr(x) for x in range(64,124)])
+        sn = _SN
         self.mcp.dev.read.return_value[2] = 60
         self.mcp.dev.read.return_value[4:64] = sn.encode("utf-8")
         v = self.mcp.read_chip_factory_serial_number()
@@ -277,9 +367,10 @@ class TestReadFlashUSBDescriptors(MCPTestCase):
 
 
 class TestWriteFlashUSBDescriptors(MCPTestCase):
+    descr = _DESCR
+
     def setUp(self):
         super().setUp()
-        self.descr = "".join([chr(x) for x in range(64,94)])
         xb0 = bytearray(64)
         xb0[0:3] = [0xb0]
         self.mcp._read_response = Mock()
@@ -287,36 +378,44 @@ class TestWriteFlashUSBDescriptors(MCPTestCase):
 
     def test_write_usb_manufacturer_descriptor(self):
         self.mcp.write_usb_manufacturer_descriptor(self.descr)
-        self.assertEqual(int(self.mcp.dev.write.call_args[0][0][2]), 2*len(self.descr)+2)
-        self.assertEqual(self.mcp.dev.write.call_args[0][0][4:].decode("utf-16"), self.descr)
+        cmd = self.mcp.dev.write.call_args[0][0]
+        self.assertEqual(int(cmd[2]), 2*len(self.descr)+2)
+        self.assertEqual(cmd[4:].decode("utf-16"), self.descr)
         self.mcp.usb_manufacturer_descriptor = self.descr
-        self.assertEqual(int(self.mcp.dev.write.call_args[0][0][2]), 2*len(self.descr)+2)
-        self.assertEqual(self.mcp.dev.write.call_args[0][0][4:].decode("utf-16"), self.descr)
-        
+        cmd = self.mcp.dev.write.call_args[0][0]
+        self.assertEqual(int(cmd[2]), 2*len(self.descr)+2)
+        self.assertEqual(cmd[4:].decode("utf-16"), self.descr)
+
     def test_write_usb_product_descriptor(self):
         self.mcp.write_usb_product_descriptor(self.descr)
-        self.assertEqual(int(self.mcp.dev.write.call_args[0][0][2]), 2*len(self.descr)+2)
-        self.assertEqual(self.mcp.dev.write.call_args[0][0][4:].decode("utf-16"), self.descr)
+        cmd = self.mcp.dev.write.call_args[0][0]
+        self.assertEqual(int(cmd[2]), 2*len(self.descr)+2)
+        self.assertEqual(cmd[4:].decode("utf-16"), self.descr)
         self.mcp.usb_product_descriptor = self.descr
-        self.assertEqual(int(self.mcp.dev.write.call_args[0][0][2]), 2*len(self.descr)+2)
-        self.assertEqual(self.mcp.dev.write.call_args[0][0][4:].decode("utf-16"), self.descr)
+        cmd = self.mcp.dev.write.call_args[0][0]
+        self.assertEqual(int(cmd[2]), 2*len(self.descr)+2)
+        self.assertEqual(cmd[4:].decode("utf-16"), self.descr)
 
     def test_write_usb_serial_number_descriptor(self):
         self.mcp.write_usb_serial_number_descriptor(self.descr)
-        self.assertEqual(int(self.mcp.dev.write.call_args[0][0][2]), 2*len(self.descr)+2)
-        self.assertEqual(self.mcp.dev.write.call_args[0][0][4:].decode("utf-16"), self.descr)
+        cmd = self.mcp.dev.write.call_args[0][0]
+        self.assertEqual(int(cmd[2]), 2*len(self.descr)+2)
+        self.assertEqual(cmd[4:].decode("utf-16"), self.descr)
         self.mcp.usb_serial_number_descriptor = self.descr
-        self.assertEqual(int(self.mcp.dev.write.call_args[0][0][2]), 2*len(self.descr)+2)
-        self.assertEqual(self.mcp.dev.write.call_args[0][0][4:].decode("utf-16"), self.descr)
+        cmd = self.mcp.dev.write.call_args[0][0]
+        self.assertEqual(int(cmd[2]), 2*len(self.descr)+2)
+        self.assertEqual(cmd[4:].decode("utf-16"), self.descr)
 
     def test_write_chip_factory_serial_number(self):
-        sn = "".join([chr(x) for x in range(64,124)])
+        sn = _SN
         self.mcp.write_chip_factory_serial_number(sn)
-        self.assertEqual(int(self.mcp.dev.write.call_args[0][0][2]), len(sn))
-        self.assertEqual(self.mcp.dev.write.call_args[0][0][4:].decode("utf-8"), sn)
+        cmd = self.mcp.dev.write.call_args[0][0]
+        self.assertEqual(int(cmd[2]), len(sn))
+        self.assertEqual(cmd[4:].decode("utf-8"), sn)
         self.mcp.chip_factory_serial_number = sn
-        self.assertEqual(int(self.mcp.dev.write.call_args[0][0][2]), len(sn))
-        self.assertEqual(self.mcp.dev.write.call_args[0][0][4:].decode("utf-8"), sn)
+        cmd = self.mcp.dev.write.call_args[0][0]
+        self.assertEqual(int(cmd[2]), len(sn))
+        self.assertEqual(cmd[4:].decode("utf-8"), sn)
 
 
 class TestReadFlashGPSettings(MCPTestWithReadMock):
@@ -340,7 +439,7 @@ class TestReadFlashGPSettings(MCPTestWithReadMock):
     def test_read_gpio_function(self):
         for pin in range(4):
             self.xb0_01[4+pin] = 0b00000010
-            expected = getattr(mcp2221.enums, "GPIO{:d}Function".format(pin))(2)
+            expected = GPIO_FN_CLS[pin](2)
             v = getattr(self.mcp, "gpio{:d}_read_function".format(pin))()
             self.assertEqual(v, expected)
             v = getattr(self.mcp, "gpio{:d}_function".format(pin))
@@ -355,6 +454,9 @@ class TestWriteFlashGPSettings(MCPTestCase):
         self.xb0_01[0:3] = [0xb0, 0, 4]
         self.mcp._read_response.return_value = self.xb0_01
         self.mcp.set_default_memory_target(MemoryType.Flash)
+        # command encoding is what is under test here => force writes
+        # even when they wouldn't change the stored value
+        self.mcp.skip_noop_flash_writes = False
 
     def test_write_gpio_powerup_value(self):
         for pin in range(4):
@@ -368,12 +470,29 @@ class TestWriteFlashGPSettings(MCPTestCase):
 
     def test_write_gpio_function(self):
         for pin in range(4):
-            value = getattr(mcp2221.enums, "GPIO{:d}Function".format(pin))(2)
+            value = GPIO_FN_CLS[pin](2)
             getattr(self.mcp, "gpio{:d}_write_function".format(pin))(value)
             self.assertEqual(self.mcp.dev.write.call_args[0][0][2+pin], 0b00000010)
             setattr(self.mcp, "gpio{:d}_function".format(pin), value)
             self.assertEqual(self.mcp.dev.write.call_args[0][0][2+pin], 0b00000010)
 
+    def test_write_flash_gpio_settings(self):
+        self.mcp.write_flash_gpio_settings({0: (GPIO0Function.UartRxLed, GPIODirection.Input, True),
+                                            2: (None, None, True)})
+        cmd = self.mcp.dev.write.call_args[0][0]
+        self.assertEqual(cmd[0], 0xb1)
+        self.assertEqual(cmd[1], FlashDataSubcode.GPSettings)
+        self.assertEqual(cmd[2], 0b00011010)
+        self.assertEqual(cmd[3], 0)
+        self.assertEqual(cmd[4], 0b00010000)
+        self.assertEqual(cmd[5], 0)
+        # one read of current settings, one write
+        self.assertEqual(self.mcp.dev.write.call_count, 2)
+
+    def test_write_flash_gpio_settings_invalid_pin(self):
+        with self.assertRaises(InvalidParameterException):
+            self.mcp.write_flash_gpio_settings({4: (None, None, True)})
+
 
 
 
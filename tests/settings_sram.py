@@ -92,6 +92,34 @@ class TestWriteSRAMChipSettings(MCPTestWithReadMock):
         self.mcp.dac_value = 31
         self.assertEqual(self.mcp.dev.write.call_args[0][0][4], 0b10011111)
 
+    def test_write_dac_sequence(self):
+        self.mcp.write_dac_sequence([0, 15, 31])
+        values = [c[0][0][4] for c in self.mcp.dev.write.call_args_list]
+        self.assertEqual(values, [0b10000000, 0b10001111, 0b10011111])
+
+    def test_write_dac_settings(self):
+        self.mcp.write_dac_settings(ReferenceVoltageSource.Internal,
+                                    ReferenceVoltageValue.Voltage2_048V, 31)
+        cmd = self.mcp.dev.write.call_args[0][0]
+        self.assertEqual(cmd[3], 0b10000101)
+        self.assertEqual(cmd[4], 0b10011111)
+        self.assertEqual(self.mcp.dev.write.call_count, 1)
+
+    def test_write_dac_settings_partial(self):
+        # value only => vref byte left untouched, no SRAM read needed
+        self.mcp.write_dac_settings(value=5)
+        cmd = self.mcp.dev.write.call_args[0][0]
+        self.assertEqual(cmd[3], 0)
+        self.assertEqual(cmd[4], 0b10000101)
+        self.assertEqual(self.mcp.dev.write.call_count, 1)
+        # voltage only => current source is read from SRAM first
+        self.x61[6] = 0b00100000
+        self.mcp.write_dac_settings(voltage=ReferenceVoltageValue.Voltage1_024V)
+        cmd = self.mcp.dev.write.call_args[0][0]
+        self.assertEqual(cmd[3], 0b10000011)
+        self.assertEqual(cmd[4], 0)
+        self.assertEqual(self.mcp.dev.write.call_count, 3)
+
     def test_write_adc_reference_voltage(self):
         self.mcp.write_adc_reference_voltage(ReferenceVoltageValue.Voltage4_096V)
         self.assertEqual(self.mcp.dev.write.call_args[0][0][5], 0b10000110)
@@ -104,6 +132,19 @@ class TestWriteSRAMChipSettings(MCPTestWithReadMock):
         self.mcp.adc_reference_source = ReferenceVoltageSource.Internal
         self.assertEqual(self.mcp.dev.write.call_args[0][0][5], 0b10000001)
 
+    def test_write_adc_reference(self):
+        self.mcp.write_adc_reference(ReferenceVoltageValue.Voltage2_048V,
+                                     ReferenceVoltageSource.Internal)
+        self.assertEqual(self.mcp.dev.write.call_args[0][0][5], 0b10000101)
+        # both fields given => no read needed, single transaction
+        self.assertEqual(self.mcp.dev.write.call_count, 1)
+
+    def test_write_dac_reference(self):
+        self.mcp.write_dac_reference(ReferenceVoltageValue.Voltage2_048V,
+                                     ReferenceVoltageSource.Internal)
+        self.assertEqual(self.mcp.dev.write.call_args[0][0][3], 0b10000101)
+        self.assertEqual(self.mcp.dev.write.call_count, 1)
+
     def test_write_interrupt_on_falling_edge(self):
         self.mcp.write_interrupt_on_falling_edge(True)
         self.assertEqual(self.mcp.dev.write.call_args[0][0][6], 0b10011000)
@@ -116,6 +157,14 @@ class TestWriteSRAMChipSettings(MCPTestWithReadMock):
         self.mcp.interrupt_on_rising_edge = True
         self.assertEqual(self.mcp.dev.write.call_args[0][0][6], 0b10000110)
     
+    def test_write_interrupt_on_edges(self):
+        self.mcp.write_interrupt_on_edges(falling=True, rising=False)
+        self.assertEqual(self.mcp.dev.write.call_args[0][0][6], 0b10011100)
+        self.assertEqual(self.mcp.dev.write.call_count, 1)
+        # edges left to None keep their alter-enable bit cleared
+        self.mcp.write_interrupt_on_edges(rising=True)
+        self.assertEqual(self.mcp.dev.write.call_args[0][0][6], 0b10000110)
+
     def test_clear_interrupt_flag(self):
         self.mcp.clear_interrupt_flag()
         self.assertEqual(self.mcp.dev.write.call_args[0][0][6], 0b10000001)
@@ -131,19 +180,29 @@ class TestGPIOFunctionSRAM(MCPTestWithReadMock):
     
     def test_write_gpio_function(self):
         for pin in range(4):
-            value = getattr(mcp2221.enums, "GPIO{:d}Function".format(pin))(2)
+            value = GPIO_FN_CLS[pin](2)
+            # reset between invocations so the call history stays short
+            # and each half gets checked against its own GP write command
+            self.mcp.dev.write.reset_mock()
             getattr(self.mcp, "gpio{:d}_write_function".format(pin))(value)
-            pin_args = self.mcp.dev.write.call_args_list[-2][0][0]
-            self.assertEqual(pin_args[7], 0b10000000)
-            self.assertEqual(pin_args[8+pin], 0b00000010)
+            cmd = self.mcp.dev.write.call_args_list[-2][0][0]
+            self.assertEqual(cmd[7], 0b10000000)
+            self.assertEqual(cmd[8+pin], 0b00000010)
+            self.mcp.dev.write.reset_mock()
             setattr(self.mcp, "gpio{:d}_function".format(pin), value)
-            self.assertEqual(pin_args[7], 0b10000000)
-            self.assertEqual(pin_args[8+pin], 0b00000010)
+            cmd = self.mcp.dev.write.call_args_list[-2][0][0]
+            self.assertEqual(cmd[7], 0b10000000)
+            self.assertEqual(cmd[8+pin], 0b00000010)
     
+    def test_write_gpio_function_transaction_count(self):
+        self.mcp.gpio0_write_function(GPIO0Function.GPIO)
+        # one 0x61 read, one 0x51 read, GP-altering 0x60, vref restore 0x60
+        self.assertEqual(self.mcp.dev.write.call_count, 4)
+
     def test_read_gpio_function(self):
         for pin in range(4):
             self.x61[22+pin] = 0b00000010
-            expected = getattr(mcp2221.enums, "GPIO{:d}Function".format(pin))(2)
+            expected = GPIO_FN_CLS[pin](2)
             v = getattr(self.mcp, "gpio{:d}_read_function".format(pin))()
             self.assertEqual(v, expected)
             v = getattr(self.mcp, "gpio{:d}_function".format(pin))
@@ -1,6 +1,10 @@
 from .common import *
 
-__all__ = ["TestStatusSetParameters"]
+__all__ = ["TestStatusSetParameters", "TestStatusSnapshot"]
+
+# enum members listed once instead of re-iterating the enum per test run
+_CANCEL_RESPONSES = tuple(I2CCancelTransferResponse)
+_SPEED_RESPONSES = tuple(I2CSetSpeedResponse)
 
 class TestStatusSetParameters(MCPTestWithReadMock):
     # command 0x10
@@ -10,24 +14,30 @@ class TestStatusSetParameters(MCPTestWithReadMock):
         self.x10 = self.mcp._read_response.return_value
 
     def test_i2c_cancel_transfer(self):
-        for v in I2CCancelTransferResponse:
+        for v in _CANCEL_RESPONSES:
             self.x10[2] = v
             ret = self.mcp.i2c_cancel_transfer()
             self.assertEqual(self.mcp.dev.write.call_args[0][0][2], 0x10)
             self.assertEqual(ret, v)
     
     def test_i2c_write_speed_ok(self):
-        for v in I2CSetSpeedResponse:
+        # hoist invariant lookups out of the 2x256-iteration loop
+        write_speed = self.mcp.i2c_write_speed
+        dev_write = self.mcp.dev.write
+        for v in _SPEED_RESPONSES:
             self.x10[3] = v
             for w in range(0,256):
                 self.x10[14] = w
-                ret = self.mcp.i2c_write_speed(12000000//(w+3))
-                self.assertEqual(self.mcp.dev.write.call_args[0][0][3], 0x20)
-                self.assertEqual(self.mcp.dev.write.call_args[0][0][4], w)
+                speed = 12000000//(w+3)
+                ret = write_speed(speed)
+                cmd = dev_write.call_args[0][0]
+                self.assertEqual(cmd[3], 0x20)
+                self.assertEqual(cmd[4], w)
                 self.assertEqual(ret, v)
-                self.mcp.i2c_speed = 12000000//(w+3)
-                self.assertEqual(self.mcp.dev.write.call_args[0][0][3], 0x20)
-                self.assertEqual(self.mcp.dev.write.call_args[0][0][4], w)
+                self.mcp.i2c_speed = speed
+                cmd = dev_write.call_args[0][0]
+                self.assertEqual(cmd[3], 0x20)
+                self.assertEqual(cmd[4], w)
     
     def test_i2c_write_speed_fail(self):
         with self.assertRaises(InvalidParameterException):
@@ -50,8 +60,60 @@ class TestStatusSetParameters(MCPTestWithReadMock):
             self.do_test_read_func_word(self.mcp.read_adc, 50+2*n, 31, n)
             self.do_test_read_prop_word("adc{:d}_value".format(n), 50+2*n)
     
+    def test_read_adc_fail(self):
+        with self.assertRaises(InvalidParameterException):
+            self.mcp.read_adc(3)
+
+    def test_read_adcs(self):
+        for n in range(3):
+            self.x10[50+2*n:52+2*n] = [n+1, 0]
+        self.assertEqual(self.mcp.read_adcs(), [1, 2, 3])
+        self.assertEqual(self.mcp.adc_values, [1, 2, 3])
+        self.assertEqual(self.mcp.dev.write.call_count, 2)
+
+    def test_poll_state(self):
+        for n in range(3):
+            self.x10[50+2*n:52+2*n] = [n+1, 0]
+        self.x10[2:10] = [1, 0, 0, 0, 0xee, 0, 1, 0]
+        gpio, adc = self.mcp.poll_state()
+        self.assertEqual(gpio, [True, False, None, True])
+        self.assertEqual(adc, [1, 2, 3])
+        self.assertEqual(self.mcp.dev.write.call_count, 2)
+
     def test_read_firmware_version(self):
         self.x10[46:50] = b"ABCD"
         self.assertEqual(self.mcp.read_firmware_version(), "ABCD")
         self.assertEqual(self.mcp.firmware_version, "ABCD")
+        # version is immutable per session => read once, then cached
+        self.assertEqual(self.mcp.dev.write.call_count, 1)
+
+
+class TestStatusSnapshot(MCPTestWithReadMock):
+    def test_snapshot_caches_reads(self):
+        with self.mcp.status_snapshot():
+            self.mcp.read_adc(0)
+            self.mcp.read_adc(1)
+            self.mcp.read_interrupt_flag()
+            self.assertEqual(self.mcp.dev.write.call_count, 1)
+
+    def test_snapshot_cleared_on_write(self):
+        with self.mcp.status_snapshot():
+            self.mcp.read_adc(0)
+            self.mcp.i2c_cancel_transfer()
+            self.mcp.read_adc(0)
+            self.assertEqual(self.mcp.dev.write.call_count, 3)
+
+    def test_snapshot_caches_flash_reads(self):
+        with self.mcp.status_snapshot():
+            self.mcp._read_flash(FlashDataSubcode.ChipSettings)
+            self.mcp._read_flash(FlashDataSubcode.ChipSettings)
+            self.assertEqual(self.mcp.dev.write.call_count, 1)
+            # distinct registers get fetched separately
+            self.mcp._read_flash(FlashDataSubcode.GPSettings)
+            self.assertEqual(self.mcp.dev.write.call_count, 2)
 
+    def test_no_caching_outside_snapshot(self):
+        self.mcp.read_adc(0)
+        self.mcp.read_adc(0)
+        self.assertEqual(self.mcp.dev.write.call_count, 2)
+        self.assertIsNone(self.mcp._status_cache)